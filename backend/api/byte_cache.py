@@ -0,0 +1,40 @@
+from typing import Any, Dict, Hashable, Optional
+
+from cachetools import LRUCache
+
+
+class ByteLRUCache:
+    """LRU of bytes values bounded by their total size rather than their count."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.entries: LRUCache = LRUCache(maxsize=max_bytes, getsizeof=len)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: bytes):
+        # Anything bigger than the whole budget is simply not cached.
+        if len(value) <= self.max_bytes:
+            self.entries[key] = value
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.entries
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "bytes": int(self.entries.currsize),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
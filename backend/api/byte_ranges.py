@@ -0,0 +1,94 @@
+import hashlib
+import re
+from typing import Iterator, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+CHUNK_SIZE = 64 * 1024
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def content_etag(data: bytes) -> str:
+    return '"' + hashlib.blake2b(data, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def not_modified(etag: str, cache_control: Optional[str] = None) -> Response:
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return Response(status_code=304, headers=headers)
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Inclusive (start, end) for a single 'bytes=' range; None for no/unsupported range.
+
+    Raises ValueError when the range can't be satisfied.
+    """
+    if not header:
+        return None
+    match = _RANGE.match(header.strip())
+    if not match:
+        return None  # multi-range or garbage: serve the whole body
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            raise ValueError("empty suffix range")
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("range not satisfiable")
+    return start, end
+
+
+def _chunks(data: bytes) -> Iterator[bytes]:
+    view = memoryview(data)
+    for offset in range(0, len(view), CHUNK_SIZE):
+        yield bytes(view[offset:offset + CHUNK_SIZE])
+
+
+def bytes_response(
+    request: Request,
+    data: bytes,
+    media_type: str,
+    etag: Optional[str] = None,
+    cache_control: Optional[str] = None,
+) -> Response:
+    """Stream in-memory bytes with ETag/If-None-Match and single Range support."""
+    etag = etag or content_etag(data)
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+
+    headers = {"ETag": etag, "Accept-Ranges": "bytes"}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+
+    size = len(data)
+    if_range = request.headers.get("if-range")
+    try:
+        byte_range = parse_range(request.headers.get("range"), size) if not if_range or if_range == etag else None
+    except ValueError:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(_chunks(data), media_type=media_type, headers=headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(_chunks(data[start:end + 1]), status_code=206, media_type=media_type, headers=headers)
@@ -0,0 +1,268 @@
+"""Precomputed per-city place lists, so requests for known cities skip the Places calls.
+
+Build (or rebuild) the catalog offline with
+
+    python -m api.catalog --cities Jaipur Agra --kinds monuments
+
+Without --cities every gazetteer city is built; run it from cron to keep the catalog
+fresh. The server loads the catalog at startup, and cities that are not in it are
+still searched live. Setting CATALOG_REFRESH_SECONDS makes the server itself rebuild
+entries older than CATALOG_MAX_AGE_SECONDS at that interval; every worker that has it
+set does so, so enable it on one process only.
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from api.city_order import load_gazetteer, normalize_city
+from api.mongo import get_collection
+from api.places import (
+    FULL_DAY_QUERY,
+    MONUMENT_QUERY,
+    RESULTS_PER_CITY,
+    build_place_entry,
+    place_details,
+    qualifies,
+    text_search,
+)
+from api.spatial import spatial_indexes
+from api.upstream import UpstreamError
+from config.settings import (
+    CATALOG_BACKEND,
+    CATALOG_MAX_AGE_SECONDS,
+    CATALOG_PATH,
+    CATALOG_REFRESH_SECONDS,
+    GOOGLE_API_KEY_MONUMENT,
+    PLACES_CITY_CONCURRENCY,
+)
+
+CATALOG_KINDS = {"monuments": MONUMENT_QUERY, "full_day": FULL_DAY_QUERY}
+# Name and description build_place_entry falls back to, per kind, as the endpoints use them.
+PLACE_DEFAULTS = {
+    "monuments": ("Unknown", "A popular monument."),
+    "full_day": ("Unknown Experience", "A full-day activity."),
+}
+
+
+def catalog_city(city: str) -> str:
+    """Catalog key for a city name; aliases share their city's entry ('Bombay' -> 'mumbai')."""
+    entry = load_gazetteer().get(normalize_city(city))
+    return normalize_city(entry["name"] if entry else city)
+
+
+def compact_details(place: Dict[str, Any], details: Dict[str, Any]) -> Dict[str, Any]:
+    """The parts of a Place Details result that build_place_entry reads, plus the search's rating count."""
+    compact = {
+        field: details[field]
+        for field in ("name", "formatted_address", "website", "rating")
+        if details.get(field) is not None
+    }
+    compact["place_id"] = place["place_id"]
+    compact["user_ratings_total"] = place.get("user_ratings_total", 0)
+    compact["opening_hours"] = {"weekday_text": details.get("opening_hours", {}).get("weekday_text", [])}
+    location = details.get("geometry", {}).get("location", {})
+    compact["geometry"] = {"location": {"lat": location.get("lat"), "lng": location.get("lng")}}
+    if details.get("photos"):
+        compact["photos"] = [{"photo_reference": details["photos"][0]["photo_reference"]}]
+    return compact
+
+
+async def build_places(query_template: str, city: str, key: str) -> List[Dict[str, Any]]:
+    """Same search, cut-off and rating filter as the live endpoints, bypassing the place caches.
+
+    Raises UpstreamError if any call fails, so a half-built city never replaces a good entry.
+    """
+    results = await text_search(query_template.format(city=city), key, use_cache=False)
+    places = [place for place in results[:RESULTS_PER_CITY] if place.get("place_id") and qualifies(place)]
+    details = await asyncio.gather(*(place_details(place["place_id"], key, use_cache=False) for place in places))
+    return [compact_details(place, result) for place, result in zip(places, details) if result]
+
+
+def index_entries(entries: List[Dict[str, Any]]):
+    """Make cataloged places findable by /api/monuments/nearby."""
+    for entry in entries:
+        name, description = PLACE_DEFAULTS[entry["kind"]]
+        spatial_indexes[entry["kind"]].insert([
+            build_place_entry(details, 0, entry["city"].title(), GOOGLE_API_KEY_MONUMENT, name, description)
+            for details in entry["places"]
+        ])
+
+
+class FileBackend:
+    """The whole catalog as one gzipped JSON file, rewritten atomically."""
+
+    def __init__(self, path: str = CATALOG_PATH):
+        self.path = path
+
+    def _read(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return []
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write(self, entries: List[Dict[str, Any]]):
+        # Per-process temp name, so a server refresh and a CLI run can't write into the same file.
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(entries, f, separators=(",", ":"))
+        os.replace(tmp, self.path)
+
+    async def load(self) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self._read)
+
+    async def store(self, entries: List[Dict[str, Any]], changed: List[Dict[str, Any]]):
+        await asyncio.to_thread(self._write, entries)
+
+
+class MongoBackend:
+    """One document per (kind, city) in the place_catalog collection."""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def load(self) -> List[Dict[str, Any]]:
+        return await self.collection.find({}, projection={"_id": 0}).to_list(length=None)
+
+    async def store(self, entries: List[Dict[str, Any]], changed: List[Dict[str, Any]]):
+        for entry in changed:
+            await self.collection.replace_one(
+                {"_id": f"{entry['kind']}|{entry['city']}"},
+                {"_id": f"{entry['kind']}|{entry['city']}", **entry},
+                upsert=True,
+            )
+
+
+class PlaceCatalog:
+    """(kind, city) -> precomputed place details, held in memory and persisted by a backend."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.entries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.loaded = False
+        self.hits = 0
+        self.misses = 0
+
+    async def load(self):
+        entries = await self.backend.load()
+        self.entries = {(entry["kind"], entry["city"]): entry for entry in entries}
+        self.loaded = True
+        index_entries(entries)
+
+    def lookup(self, kind: str, cities: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Cataloged places for each requested city that has an entry."""
+        found = {}
+        for city in cities:
+            entry = self.entries.get((kind, catalog_city(city)))
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                found[city] = entry["places"]
+        return found
+
+    def is_stale(self, kind: str, city: str, max_age: float) -> bool:
+        entry = self.entries.get((kind, catalog_city(city)))
+        return entry is None or time.time() - entry["built_at"] >= max_age
+
+    def cities(self) -> List[str]:
+        return sorted({city for _, city in self.entries})
+
+    async def refresh(
+        self,
+        key: str,
+        cities: Optional[List[str]] = None,
+        kinds: Optional[List[str]] = None,
+        max_age: float = CATALOG_MAX_AGE_SECONDS,
+    ) -> int:
+        """Rebuild missing or stale entries (default: every city already cataloged). Returns how many changed."""
+        cities = self.cities() if cities is None else cities
+        kinds = list(CATALOG_KINDS) if kinds is None else kinds
+        targets = [(kind, city) for kind in kinds for city in cities if self.is_stale(kind, city, max_age)]
+        sem = asyncio.Semaphore(PLACES_CITY_CONCURRENCY)
+
+        async def rebuild(kind: str, city: str) -> Optional[Dict[str, Any]]:
+            async with sem:
+                try:
+                    places = await build_places(CATALOG_KINDS[kind], city, key)
+                except UpstreamError as e:
+                    print(f"Catalog build failed for {kind}/{city}: {e}")
+                    return None
+            entry = {"kind": kind, "city": catalog_city(city), "built_at": time.time(), "places": places}
+            self.entries[(kind, entry["city"])] = entry
+            return entry
+
+        changed = [entry for entry in await asyncio.gather(*(rebuild(k, c) for k, c in targets)) if entry]
+        if changed:
+            index_entries(changed)
+            await self.backend.store(list(self.entries.values()), changed)
+        return len(changed)
+
+    async def run(self, key: str, interval: float = CATALOG_REFRESH_SECONDS):
+        """Load, then keep stale entries rebuilt for as long as the server runs."""
+        try:
+            await self.load()
+        except Exception as e:
+            print(f"Catalog load failed: {e}")
+            return
+        while interval > 0 and key:
+            try:
+                rebuilt = await self.refresh(key)
+                if rebuilt:
+                    print(f"Catalog refreshed {rebuilt} entries")
+            except Exception as e:
+                print(f"Catalog refresh failed: {e}")
+            await asyncio.sleep(interval)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        built = [entry["built_at"] for entry in self.entries.values()]
+        return {
+            "backend": type(self.backend).__name__,
+            "loaded": self.loaded,
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "oldest_age_seconds": time.time() - min(built) if built else None,
+        }
+
+
+def _make_backend():
+    if CATALOG_BACKEND == "mongo":
+        collection = get_collection("place_catalog")
+        if collection is not None:
+            return MongoBackend(collection)
+    return FileBackend()
+
+
+catalog = PlaceCatalog(_make_backend())
+
+
+async def main():
+    from api.upstream import close_clients
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cities", nargs="+", help="default: every gazetteer city")
+    parser.add_argument("--kinds", nargs="+", choices=list(CATALOG_KINDS), default=list(CATALOG_KINDS))
+    parser.add_argument("--max-age", type=float, default=0, help="only rebuild entries older than this (seconds)")
+    args = parser.parse_args()
+
+    if not GOOGLE_API_KEY_MONUMENT:
+        raise SystemExit("GOOGLE_API_KEY_MONUMENT not set")
+    cities = args.cities or sorted({entry["name"] for entry in load_gazetteer().values()})
+
+    await catalog.load()
+    start = time.perf_counter()
+    try:
+        rebuilt = await catalog.refresh(GOOGLE_API_KEY_MONUMENT, cities, args.kinds, args.max_age)
+    finally:
+        await close_clients()
+    print(f"Rebuilt {rebuilt} of {len(cities) * len(args.kinds)} entries in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+import asyncio
+import json
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from api.geo import pairwise_km
+from api.places import text_search
+from api.route_solver import solve_open_path
+from config.settings import GOOGLE_API_KEY_CITY
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "cities.json")
+
+
+def normalize_city(name: str) -> str:
+    """'  Jaipur, Rajasthan ' -> 'jaipur'."""
+    return " ".join(name.split(",")[0].lower().split())
+
+
+@lru_cache(maxsize=1)
+def load_gazetteer() -> Dict[str, Dict[str, Any]]:
+    """City entries indexed by normalized name and every alias."""
+    with open(GAZETTEER_PATH, encoding="utf-8") as f:
+        entries = json.load(f)
+
+    index = {}
+    for entry in entries:
+        for name in [entry["name"], *entry.get("aliases", [])]:
+            index[normalize_city(name)] = entry
+    return index
+
+
+async def geocode_city(city: str) -> Optional[Dict[str, Any]]:
+    """Coordinates for a city the gazetteer doesn't know, via the (cached) Places text search."""
+    if not GOOGLE_API_KEY_CITY:
+        return None
+    try:
+        results = await text_search(f"{city}, India", GOOGLE_API_KEY_CITY)
+    except Exception:
+        return None
+    if not results:
+        return None
+    location = results[0].get("geometry", {}).get("location", {})
+    if location.get("lat") is None or location.get("lng") is None:
+        return None
+    # Anything we have to geocode is, by construction, not a major hub.
+    return {"name": city, "lat": location["lat"], "lng": location["lng"], "hub": 0.0}
+
+
+async def resolve_cities(cities: List[str]) -> Tuple[List[Optional[Dict[str, Any]]], List[str]]:
+    """Gazetteer entry (or geocode) per input city, plus the cities that could not be placed."""
+    gazetteer = load_gazetteer()
+    entries: List[Optional[Dict[str, Any]]] = [gazetteer.get(normalize_city(city)) for city in cities]
+    missing = [i for i, entry in enumerate(entries) if entry is None]
+    # Concurrently; the upstream client already caps how many go out at once.
+    geocoded = await asyncio.gather(*(geocode_city(cities[i]) for i in missing))
+    for i, entry in zip(missing, geocoded):
+        entries[i] = entry
+    unknown = [city for city, entry in zip(cities, entries) if entry is None]
+    return entries, unknown
+
+
+def order_from_hub(entries: List[Dict[str, Any]]) -> List[int]:
+    """Start at the best-connected city, then take the shortest open path through the rest.
+
+    Ties on hub score go to the city with the smallest total distance to the
+    others, so the entry point is also central.
+    """
+    coords = np.array([[e["lat"], e["lng"]] for e in entries], dtype=np.float64)
+    dist = pairwise_km(coords)
+    hub_scores = np.array([e.get("hub", 0.0) for e in entries])
+    candidates = np.flatnonzero(hub_scores == hub_scores.max())
+    hub = int(candidates[np.argmin(dist[candidates].sum(axis=1))])
+
+    rest = [i for i in range(len(entries)) if i != hub]
+    order = [hub] + rest
+    path = solve_open_path(dist[np.ix_(order, order)])
+    return [order[i] for i in path]
+
+
+def order_cities_locally(cities: List[str], entries: List[Dict[str, Any]]) -> List[str]:
+    if len(cities) <= 1:
+        return list(cities)
+    return [cities[i] for i in order_from_hub(entries)]
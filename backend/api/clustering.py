@@ -0,0 +1,53 @@
+from typing import List
+
+import numpy as np
+
+from api.geo import haversine_matrix, local_xy_km
+
+
+def capacitated_kmeans(xy: np.ndarray, n_clusters: int, capacity: int, max_iter: int = 50, seed: int = 42) -> np.ndarray:
+    """Size-constrained k-means: every cluster gets at most `capacity` points.
+
+    Each round solves the assignment step exactly as a min-cost matching between
+    points and `capacity` slots per centroid, then moves centroids to the mean of
+    their members, until the labels stop changing.
+    """
+    from scipy.optimize import linear_sum_assignment
+    from sklearn.cluster import KMeans
+
+    n = len(xy)
+    centers = KMeans(n_clusters=n_clusters, random_state=seed, n_init=10).fit(xy).cluster_centers_
+    labels = np.full(n, -1)
+
+    for _ in range(max_iter):
+        sq_dist = ((xy[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+        slots = np.repeat(sq_dist, capacity, axis=1)  # column c*capacity + s is slot s of centroid c
+        rows, cols = linear_sum_assignment(slots)
+        new_labels = np.empty(n, dtype=int)
+        new_labels[rows] = cols // capacity
+
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        for c in range(n_clusters):
+            members = xy[labels == c]
+            if len(members):
+                centers[c] = members.mean(axis=0)
+
+    return labels
+
+
+def intra_cluster_km(clusters: List[np.ndarray]) -> float:
+    """Sum of great-circle distances (km) from each [lat, lng] point to its cluster centroid."""
+    total = 0.0
+    for coords in clusters:
+        if len(coords) < 2:
+            continue
+        centroid = coords.mean(axis=0, keepdims=True)
+        total += float(haversine_matrix(coords, centroid).sum())
+    return total
+
+
+def balanced_labels(coords: np.ndarray, max_per_cluster: int) -> np.ndarray:
+    n_clusters = int(np.ceil(len(coords) / max_per_cluster))
+    return capacitated_kmeans(local_xy_km(coords), n_clusters, max_per_cluster)
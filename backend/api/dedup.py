@@ -1,18 +1,68 @@
+from typing import Dict, Optional
 
-_seen_place_ids = set()
+from cachetools import TTLCache
+from fastapi import Header, Query
 
-def is_duplicate(place_id: str) -> bool:
-    """Check and register a place_id. Returns True if already seen."""
-    if not place_id or place_id in _seen_place_ids:
-        return True
-    _seen_place_ids.add(place_id)
-    return False
+from config.settings import DEDUP_MAX_IDS_PER_SESSION, DEDUP_MAX_SESSIONS, DEDUP_SESSION_TTL_SECONDS
 
-def reset_seen_ids():
-    """Reset the seen IDs — useful for testing or refresh logic."""
-    _seen_place_ids.clear()
 
+class DedupContext:
+    """Place ids already shown to one session (or to one request when there is no session)."""
 
-def clear_duplicates():
-    """Clear the memory of seen monuments"""
-    _seen_place_ids.clear()
\ No newline at end of file
+    def __init__(self, seen: Optional[Dict[str, None]] = None, max_ids: int = DEDUP_MAX_IDS_PER_SESSION):
+        # A dict keeps insertion order, so the oldest id is the first to go when full.
+        self.seen = seen if seen is not None else {}
+        self.max_ids = max_ids
+
+    def is_duplicate(self, place_id: str) -> bool:
+        """Check and register a place_id. Returns True if already seen."""
+        if not place_id or place_id in self.seen:
+            return True
+        if len(self.seen) >= self.max_ids:
+            del self.seen[next(iter(self.seen))]
+        self.seen[place_id] = None
+        return False
+
+    def clear(self):
+        self.seen.clear()
+
+
+class DedupStore:
+    """Bounded, TTL-expiring map of session id -> DedupContext."""
+
+    def __init__(
+        self,
+        max_sessions: int = DEDUP_MAX_SESSIONS,
+        ttl: int = DEDUP_SESSION_TTL_SECONDS,
+        max_ids: int = DEDUP_MAX_IDS_PER_SESSION,
+    ):
+        self.sessions: TTLCache = TTLCache(maxsize=max_sessions, ttl=ttl)
+        self.max_ids = max_ids
+
+    def context(self, session_id: Optional[str]) -> DedupContext:
+        if not session_id:
+            return DedupContext(max_ids=self.max_ids)
+        ctx = self.sessions.pop(session_id, None) or DedupContext(max_ids=self.max_ids)
+        # Re-inserting refreshes the TTL, so active sessions stay alive.
+        self.sessions[session_id] = ctx
+        return ctx
+
+    def reset(self, session_id: Optional[str]):
+        if session_id:
+            self.sessions.pop(session_id, None)
+
+
+_store = DedupStore()
+
+
+def get_dedup_context(
+    x_session_id: Optional[str] = Header(None),
+    session_id: Optional[str] = Query(None),
+) -> DedupContext:
+    """FastAPI dependency: the caller's dedup context, keyed by X-Session-Id or ?session_id=."""
+    return _store.context(x_session_id or session_id)
+
+
+def reset_session(session_id: Optional[str]):
+    """Forget the ids seen by one session."""
+    _store.reset(session_id)
@@ -0,0 +1,76 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from api.metrics import stage
+from api.place_cache import PlaceCache
+from api.upstream import google_maps
+
+# 5 decimals is about a metre: the same stops always map to the same key.
+COORD_DECIMALS = 5
+
+directions_cache = PlaceCache("directions")
+
+
+def route_key(stops: List[Dict[str, Any]]) -> str:
+    return "driving|" + "|".join(
+        f"{round(s['lat'], COORD_DECIMALS)},{round(s['lng'], COORD_DECIMALS)}" for s in stops
+    )
+
+
+def summarize_route(data: Dict[str, Any]) -> Dict[str, Any]:
+    """The parts of a Directions response the itinerary map uses."""
+    routes = data.get("routes", [])
+    if not routes:
+        return {"polyline": None, "legs": []}
+    route = routes[0]
+    legs = [
+        {
+            "distance_m": leg.get("distance", {}).get("value"),
+            "duration_s": leg.get("duration", {}).get("value"),
+        }
+        for leg in route.get("legs", [])
+    ]
+    return {"polyline": route["overview_polyline"]["points"], "legs": legs}
+
+
+async def fetch_route(stops: List[Dict[str, Any]], key: str) -> Dict[str, Any]:
+    """Polyline and legs through `stops` in the given order, from the cache when these stops were routed before."""
+    cache_key = route_key(stops)
+    cached = await directions_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    params = {
+        "origin": f"{stops[0]['lat']},{stops[0]['lng']}",
+        "destination": f"{stops[-1]['lat']},{stops[-1]['lng']}",
+        "key": key,
+    }
+    waypoints = "|".join(f"{s['lat']},{s['lng']}" for s in stops[1:-1])
+    if waypoints:
+        params["waypoints"] = waypoints
+
+    with stage("directions"):
+        data = await google_maps.get_json("directions", params)
+    route = summarize_route(data)
+    if data.get("status") in ("OK", "ZERO_RESULTS"):
+        await directions_cache.set(cache_key, route)
+    return route
+
+
+async def fetch_routes(days: List[List[Dict[str, Any]]], key: str) -> List[Optional[Dict[str, Any]]]:
+    """Routes for every day at once; identical stop sequences are only requested once.
+
+    A day whose request fails gets None instead of failing the other days.
+    """
+    unique: Dict[str, List[Dict[str, Any]]] = {}
+    for stops in days:
+        unique.setdefault(route_key(stops), stops)
+
+    results = await asyncio.gather(*(fetch_route(stops, key) for stops in unique.values()), return_exceptions=True)
+    by_key = {}
+    for cache_key, result in zip(unique, results):
+        if isinstance(result, Exception):
+            print(f"Directions failed for {cache_key}: {result}")
+            result = None
+        by_key[cache_key] = result
+    return [by_key[route_key(stops)] for stops in days]
@@ -0,0 +1,71 @@
+import io
+from typing import Tuple
+
+from fastapi import UploadFile
+from PIL import Image
+
+from config.settings import QA_IMAGE_JPEG_QUALITY, QA_IMAGE_MAX_EDGE, QA_IMAGE_MAX_PIXELS, QA_IMAGE_MAX_UPLOAD_BYTES
+
+FRAME_MIME = "image/jpeg"
+
+
+class FrameTooLarge(ValueError):
+    pass
+
+
+class InvalidFrame(ValueError):
+    pass
+
+
+async def read_upload(upload: UploadFile, max_bytes: int = QA_IMAGE_MAX_UPLOAD_BYTES) -> bytes:
+    """Upload body, refusing anything over `max_bytes` without reading the rest of it."""
+    if upload.size is not None and upload.size > max_bytes:
+        raise FrameTooLarge(f"Image larger than {max_bytes} bytes.")
+    data = await upload.read(max_bytes + 1)
+    if len(data) > max_bytes:
+        raise FrameTooLarge(f"Image larger than {max_bytes} bytes.")
+    return data
+
+
+def target_size(width: int, height: int, max_edge: int) -> Tuple[int, int]:
+    scale = min(1.0, max_edge / max(width, height))
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def decode_frame(image_bytes: bytes, max_edge: int = QA_IMAGE_MAX_EDGE) -> Image.Image:
+    """Decode once, straight from memory, at no more than `max_edge` pixels on the long side.
+
+    JPEGs are decoded at a reduced DCT scale (Image.draft), so a 8K
+    equirectangular frame never exists in memory at full size.
+    """
+    if len(image_bytes) > QA_IMAGE_MAX_UPLOAD_BYTES:
+        raise FrameTooLarge(f"Image larger than {QA_IMAGE_MAX_UPLOAD_BYTES} bytes.")
+    try:
+        img = Image.open(io.BytesIO(image_bytes))
+        if img.width * img.height > QA_IMAGE_MAX_PIXELS:
+            raise FrameTooLarge(f"Image has more than {QA_IMAGE_MAX_PIXELS} pixels.")
+        size = target_size(img.width, img.height, max_edge)
+        if img.format == "JPEG":
+            img.draft("RGB", size)
+        # load() inside convert() is the only full decode; truncated or corrupt data fails here.
+        img = img.convert("RGB")
+    except FrameTooLarge:
+        raise
+    except Exception as img_err:
+        raise InvalidFrame("Invalid or corrupted image file.") from img_err
+
+    if img.size != size:
+        img.thumbnail(size, Image.Resampling.BICUBIC)
+    return img
+
+
+def encode_frame(img: Image.Image, quality: int = QA_IMAGE_JPEG_QUALITY) -> bytes:
+    out = io.BytesIO()
+    img.save(out, format="JPEG", quality=quality)
+    return out.getvalue()
+
+
+def prepare_frame(image_bytes: bytes) -> Tuple[Image.Image, bytes]:
+    """Downscaled RGB frame plus the compact JPEG that is sent to Gemini."""
+    img = decode_frame(image_bytes)
+    return img, encode_frame(img)
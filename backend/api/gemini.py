@@ -0,0 +1,31 @@
+"""Gemini model handles bound to an explicit API key.
+
+genai.configure() sets one process-wide key, so a second call (the itinerary
+key after the Gemini key) silently re-routes every model. Here each key gets
+its own client manager, and the SDK is only imported on first use.
+"""
+from typing import Any, Dict
+
+_managers: Dict[str, Any] = {}
+
+
+def _client_manager(api_key: str):
+    manager = _managers.get(api_key)
+    if manager is None:
+        from google.generativeai.client import _ClientManager
+
+        manager = _ClientManager()
+        manager.configure(api_key=api_key)
+        _managers[api_key] = manager
+    return manager
+
+
+def gemini_model(model_name: str, api_key: str):
+    """A GenerativeModel whose sync and async calls use `api_key`, whatever genai.configure() says."""
+    import google.generativeai as genai
+
+    manager = _client_manager(api_key)
+    model = genai.GenerativeModel(model_name)
+    model._client = manager.get_default_client("generative")
+    model._async_client = manager.get_default_client("generative_async")
+    return model
@@ -0,0 +1,82 @@
+import math
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from cachetools import LRUCache
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Bounded by bytes: one 500-stop matrix alone is 2 MB.
+MATRIX_CACHE_BYTES = 32 * 1024 * 1024
+_matrix_cache: LRUCache = LRUCache(maxsize=MATRIX_CACHE_BYTES, getsizeof=lambda dist: dist.nbytes)
+
+
+def coords_of(items: List[Any]) -> np.ndarray:
+    """(n, 2) array of [lat, lng] from dicts or objects with lat/lng."""
+    if items and isinstance(items[0], dict):
+        return np.array([[m["lat"], m["lng"]] for m in items], dtype=np.float64)
+    return np.array([[m.lat, m.lng] for m in items], dtype=np.float64)
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    φ1, φ2 = math.radians(lat1), math.radians(lat2)
+    Δφ = math.radians(lat2 - lat1)
+    Δλ = math.radians(lon2 - lon1)
+    a = math.sin(Δφ / 2) ** 2 + math.cos(φ1) * math.cos(φ2) * math.sin(Δλ / 2) ** 2
+    return EARTH_RADIUS_KM * 2 * math.asin(min(1.0, math.sqrt(a)))
+
+
+def haversine_matrix(a: np.ndarray, b: Optional[np.ndarray] = None, dtype=np.float64) -> np.ndarray:
+    """Great-circle distances (km) between every row of ``a`` and every row of ``b``.
+
+    Rows are [lat, lng] in degrees. ``b`` defaults to ``a``.
+    """
+    a = np.radians(np.asarray(a, dtype=dtype))
+    b = a if b is None else np.radians(np.asarray(b, dtype=dtype))
+    lat_a, lng_a = a[:, 0:1], a[:, 1:2]
+    lat_b, lng_b = b[:, 0][None, :], b[:, 1][None, :]
+
+    h = np.sin((lat_b - lat_a) / 2) ** 2 + np.cos(lat_a) * np.cos(lat_b) * np.sin((lng_b - lng_a) / 2) ** 2
+    return (2 * EARTH_RADIUS_KM) * np.arcsin(np.sqrt(np.clip(h, 0, 1)))
+
+
+def pairwise_km(coords: np.ndarray, dtype=np.float64, cache: bool = True) -> np.ndarray:
+    """Symmetric distance matrix for ``coords``; cached by coordinate set and returned read-only."""
+    coords = np.ascontiguousarray(coords, dtype=dtype)
+    key = (coords.dtype.str, coords.shape, coords.tobytes())
+    if cache:
+        cached = _matrix_cache.get(key)
+        if cached is not None:
+            return cached
+
+    dist = haversine_matrix(coords, dtype=dtype)
+    np.fill_diagonal(dist, 0)
+    dist.setflags(write=False)
+    if cache and dist.nbytes <= MATRIX_CACHE_BYTES:
+        _matrix_cache[key] = dist
+    return dist
+
+
+def local_xy_km(coords: np.ndarray) -> np.ndarray:
+    """Equirectangular projection around the centroid, in km.
+
+    Euclidean distance on the result approximates haversine within a city,
+    which is what KMeans needs.
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    lat0 = np.radians(coords[:, 0].mean())
+    rad = np.radians(coords)
+    x = rad[:, 1] * np.cos(lat0) * EARTH_RADIUS_KM
+    y = rad[:, 0] * EARTH_RADIUS_KM
+    return np.column_stack([x, y])
+
+
+def mean_distance_to_others(dist: np.ndarray) -> np.ndarray:
+    n = len(dist)
+    if n < 2:
+        return np.zeros(n)
+    return dist.sum(axis=1) / (n - 1)
+
+
+def cache_info() -> Dict[str, int]:
+    return {"entries": len(_matrix_cache), "bytes": int(_matrix_cache.currsize), "max_bytes": int(_matrix_cache.maxsize)}
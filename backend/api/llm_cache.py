@@ -0,0 +1,127 @@
+import hashlib
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional
+
+from cachetools import TTLCache
+
+from api.mongo import get_collection
+from config.settings import LLM_CACHE_BACKEND, LLM_CACHE_SIZE, LLM_CACHE_TTL_SECONDS
+
+
+def normalize_prompt(prompt: str) -> str:
+    return " ".join(prompt.split())
+
+
+def cache_key(model: str, prompt: str, extra: str = "") -> str:
+    """Content address of one LLM call: model, whitespace-normalized prompt and any extra input digest."""
+    payload = "\0".join([model, normalize_prompt(prompt), extra])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def city_set_key(model: str, cities: Iterable[str]) -> str:
+    """Order-insensitive key over a set of city names."""
+    names = sorted({" ".join(city.lower().split()) for city in cities})
+    return cache_key(model, "city-order:" + "|".join(names))
+
+
+def image_dhash(image, size: int = 8) -> str:
+    """64-bit difference hash of a PIL image; near-identical frames get the same hash."""
+    gray = image.convert("L").resize((size + 1, size))
+    pixels = list(gray.getdata())
+    bits = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            right = pixels[row * (size + 1) + col + 1]
+            bits = (bits << 1) | (left > right)
+    return f"{bits:0{size * size // 4}x}"
+
+
+class MemoryBackend:
+    def __init__(self, maxsize: int = LLM_CACHE_SIZE, ttl: int = LLM_CACHE_TTL_SECONDS):
+        self.entries: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self.entries.get(key)
+
+    async def set(self, key: str, value: Any):
+        self.entries[key] = value
+
+    def size(self) -> int:
+        return len(self.entries)
+
+
+class MongoBackend:
+    """Entries live in the llm_cache collection; a TTL index on expires_at drops stale ones."""
+
+    def __init__(self, collection, ttl: int = LLM_CACHE_TTL_SECONDS):
+        self.collection = collection
+        self.ttl = ttl
+        self._indexed = False
+
+    async def get(self, key: str) -> Optional[Any]:
+        doc = await self.collection.find_one({"_id": key})
+        if doc and doc["expires_at"].replace(tzinfo=timezone.utc) > datetime.now(timezone.utc):
+            return doc["value"]
+        return None
+
+    async def set(self, key: str, value: Any):
+        if not self._indexed:
+            await self.collection.create_index("expires_at", expireAfterSeconds=0)
+            self._indexed = True
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl)
+        await self.collection.replace_one(
+            {"_id": key}, {"_id": key, "value": value, "expires_at": expires_at}, upsert=True
+        )
+
+    def size(self) -> int:
+        return -1
+
+
+class LLMCache:
+    """Response cache shared by the Gemini-backed endpoints, with per-endpoint hit counters."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits: Dict[str, int] = defaultdict(int)
+        self.misses: Dict[str, int] = defaultdict(int)
+
+    async def get(self, endpoint: str, key: str) -> Optional[Any]:
+        try:
+            value = await self.backend.get(key)
+        except Exception:
+            value = None  # a cache outage must not take the endpoint down with it
+        if value is None:
+            self.misses[endpoint] += 1
+        else:
+            self.hits[endpoint] += 1
+        return value
+
+    async def set(self, key: str, value: Any):
+        try:
+            await self.backend.set(key, value)
+        except Exception:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        endpoints = {}
+        for endpoint in sorted(set(self.hits) | set(self.misses)):
+            hits, misses = self.hits[endpoint], self.misses[endpoint]
+            endpoints[endpoint] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            }
+        return {"backend": type(self.backend).__name__, "size": self.backend.size(), "endpoints": endpoints}
+
+
+def _make_backend():
+    if LLM_CACHE_BACKEND == "mongo":
+        collection = get_collection("llm_cache")
+        if collection is not None:
+            return MongoBackend(collection)
+    return MemoryBackend()
+
+
+llm_cache = LLMCache(_make_backend())
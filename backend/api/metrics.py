@@ -0,0 +1,181 @@
+"""In-process metrics with Prometheus text exposition, served at /metrics."""
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+# Upper bounds in seconds; +Inf is implied.
+LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+
+Labels = Tuple[str, ...]
+
+
+def _label_text(names: Tuple[str, ...], values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _CounterChild:
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.children: Dict[Labels, _CounterChild] = {}
+
+    def labels(self, *values: str) -> _CounterChild:
+        child = self.children.get(values)
+        if child is None:
+            child = self.children[values] = _CounterChild()
+        return child
+
+    def inc(self, *values: str, amount: float = 1):
+        self.labels(*values).inc(amount)
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        for values, child in sorted(self.children.items()):
+            yield f"{self.name}{_label_text(self.labelnames, values)} {_number(child.value)}"
+
+
+class _HistogramChild:
+    def __init__(self, buckets: List[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        out, running = [], 0
+        for bound, count in zip([*map(str, self.buckets), "+Inf"], self.counts):
+            running += count
+            out.append((bound, running))
+        return out
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"buckets": dict(self.cumulative()), "sum": self.sum, "count": self.count}
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = (), buckets: List[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self.children: Dict[Labels, _HistogramChild] = {}
+
+    def labels(self, *values: str) -> _HistogramChild:
+        child = self.children.get(values)
+        if child is None:
+            child = self.children[values] = _HistogramChild(self.buckets)
+        return child
+
+    def observe(self, value: float, *values: str):
+        self.labels(*values).observe(value)
+
+    @contextmanager
+    def time(self, *values: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.labels(*values).observe(time.perf_counter() - start)
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for values, child in sorted(self.children.items()):
+            for bound, count in child.cumulative():
+                le = 'le="' + bound + '"'
+                yield f"{self.name}_bucket{_label_text(self.labelnames, values, le)} {count}"
+            yield f"{self.name}_sum{_label_text(self.labelnames, values)} {_number(child.sum)}"
+            yield f"{self.name}_count{_label_text(self.labelnames, values)} {child.count}"
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[Any] = []
+        self.collectors: List[Callable[[], Iterator[str]]] = []
+
+    def counter(self, name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        metric = Counter(name, help, labelnames)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help: str, labelnames: Tuple[str, ...] = (), buckets: List[float] = LATENCY_BUCKETS) -> Histogram:
+        metric = Histogram(name, help, labelnames, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def collector(self, fn: Callable[[], Iterator[str]]):
+        """Lines computed at scrape time, for state that already lives elsewhere (cache stats)."""
+        self.collectors.append(fn)
+        return fn
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for collect in self.collectors:
+            try:
+                lines.extend(collect())
+            except Exception as e:
+                lines.append(f"# collector {collect.__name__} failed: {e}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_request_seconds = registry.histogram(
+    "voyage_http_request_seconds", "Time to response start per route.", ("method", "route", "status")
+)
+stage_seconds = registry.histogram(
+    "voyage_stage_seconds", "Time spent in named stages of request handling.", ("stage",)
+)
+upstream_requests = registry.counter(
+    "voyage_upstream_requests_total", "Outbound calls by result (HTTP status, error type, retry, circuit_open).",
+    ("upstream", "endpoint", "outcome"),
+)
+upstream_seconds = registry.histogram(
+    "voyage_upstream_request_seconds", "Latency of each outbound HTTP attempt.", ("upstream", "endpoint")
+)
+
+
+def stage(name: str):
+    """with stage("kmeans"): ... -- wall time, so it also works around awaits."""
+    return stage_seconds.time(name)
+
+
+def cache_lines(name: str, caches: Dict[str, Dict[str, Any]]) -> Iterator[str]:
+    """Hit/miss/size gauges from the stats() dicts the caches already keep."""
+    for field in ("hits", "misses", "persistent_hits", "evictions", "size", "entries", "bytes"):
+        rows = [(cache, stats[field]) for cache, stats in caches.items() if isinstance(stats.get(field), (int, float))]
+        if not rows:
+            continue
+        metric = f"voyage_{name}_cache_{field}"
+        yield f"# TYPE {metric} gauge"
+        for cache, value in rows:
+            yield f'{metric}{{cache="{cache}"}} {value}'
@@ -0,0 +1,24 @@
+from typing import Optional
+
+from config.settings import MONGODB_URI
+
+MONGODB_DATABASE = "shashwat"
+
+_db = None
+
+
+def get_db():
+    """Shared motor database handle, created on first use. None when MONGODB_URI is unset."""
+    global _db
+    if not MONGODB_URI:
+        return None
+    if _db is None:
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        _db = AsyncIOMotorClient(MONGODB_URI)[MONGODB_DATABASE]
+    return _db
+
+
+def get_collection(name: str) -> Optional[object]:
+    db = get_db()
+    return db[name] if db is not None else None
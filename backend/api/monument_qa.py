@@ -1,14 +1,13 @@
-import os
+import asyncio
+from typing import AsyncIterator, Iterator
 from dotenv import load_dotenv
-from PIL import Image
-import tempfile
-import traceback
-import google.generativeai as genai
-
-from elevenlabs import stream, VoiceSettings
-from elevenlabs.client import ElevenLabs
-from elevenlabs.core.api_error import ApiError
 
+from api.frames import FRAME_MIME, prepare_frame
+from api.gemini import gemini_model
+from api.llm_cache import cache_key, image_dhash, llm_cache
+from api.metrics import stage
+from api.tts_cache import tts_cache, tts_key
+from api.voice_stream import gemini_tokens, iterate_in_thread, split_sentences, stream_speech
 from config.settings import (
     GOOGLE_GEMINI_API_KEY,
     ELEVAN_LABS_API_KEY,
@@ -17,9 +16,7 @@ from config.settings import (
 
 load_dotenv()
 
-genai.configure(api_key=GOOGLE_GEMINI_API_KEY)
-
-eleven = ElevenLabs(api_key=ELEVAN_LABS_API_KEY)
+QA_MODEL = "gemini-2.0-flash-001"
 
 
 def build_prompt(monument_name: str, user_question: str) -> str:
@@ -33,66 +30,150 @@ def build_prompt(monument_name: str, user_question: str) -> str:
     )
 
 
+FALLBACK_ANSWER = "Sorry! I couldn’t come up with a good answer right now."
+
+
 async def answer_query(image_bytes: bytes, user_question: str, monument_name: str) -> dict:
     if not GOOGLE_GEMINI_API_KEY:
         raise RuntimeError("GOOGLE_GEMINI_API_KEY not set")
 
-    try:
-        model = genai.GenerativeModel("gemini-2.0-flash-001")
-
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmp:
-            tmp.write(image_bytes)
-            tmp_path = tmp.name
+    model = gemini_model(QA_MODEL, GOOGLE_GEMINI_API_KEY)
+    img, jpeg = await asyncio.to_thread(prepare_frame, image_bytes)
+    frame = {"mime_type": FRAME_MIME, "data": jpeg}
 
-        try:
-            with Image.open(tmp_path) as img:
-                img.verify()  # Check if corrupted
-                img = Image.open(tmp_path).convert("RGB")
-        except Exception as img_err:
-            raise RuntimeError("Invalid or corrupted image file.") from img_err
+    prompt = build_prompt(monument_name, user_question)
 
-        prompt = build_prompt(monument_name, user_question)
-        print("Prompt being sent to Gemini:\n", prompt)
+    key = cache_key(QA_MODEL, prompt, image_dhash(img))
+    answer_text = await llm_cache.get("qa", key)
 
+    if answer_text is None:
         try:
-            response = model.generate_content([prompt, img], stream=False)
+            with stage("gemini_qa"):
+                response = await model.generate_content_async([prompt, frame], stream=False)
         except Exception as genai_err:
             raise RuntimeError("Failed to generate content from Gemini.") from genai_err
 
         if hasattr(response, "text") and response.text:
             answer_text = response.text.strip()
+            await llm_cache.set(key, answer_text)
         else:
-            answer_text = "Sorry! I couldn’t come up with a good answer right now."
+            answer_text = FALLBACK_ANSWER
 
-        audio_bytes = text_to_speech_elevenlabs(answer_text)
+    audio_bytes = await text_to_speech_cached(answer_text)
 
-        return {
-            "answer": answer_text,
-            "audio": audio_bytes,
-        }
+    return {
+        "answer": answer_text,
+        "audio": audio_bytes,
+        "audio_key": speech_key(answer_text),
+    }
 
-    finally:
-        # Clean up the temporary file
-        if os.path.exists(tmp_path):
-            os.remove(tmp_path)
 
+async def stream_answer_audio(image_bytes: bytes, user_question: str, monument_name: str) -> AsyncIterator[bytes]:
+    """mp3 chunks for the answer, sentence by sentence, while Gemini is still writing the rest."""
+    if not GOOGLE_GEMINI_API_KEY:
+        raise RuntimeError("GOOGLE_GEMINI_API_KEY not set")
+
+    model = gemini_model(QA_MODEL, GOOGLE_GEMINI_API_KEY)
+    img, jpeg = await asyncio.to_thread(prepare_frame, image_bytes)
+    frame = {"mime_type": FRAME_MIME, "data": jpeg}
+    prompt = build_prompt(monument_name, user_question)
+
+    key = cache_key(QA_MODEL, prompt, image_dhash(img))
+    cached = await llm_cache.get("qa", key)
+
+    async def tokens():
+        if cached is not None:
+            yield cached
+            return
+        parts = []
+        with stage("gemini_qa_stream"):
+            async for token in gemini_tokens(model, [prompt, frame]):
+                parts.append(token)
+                yield token
+        answer_text = "".join(parts).strip()
+        if answer_text:
+            await llm_cache.set(key, answer_text)
+        else:
+            yield FALLBACK_ANSWER
+
+    return stream_speech(split_sentences(tokens()), synthesize_speech)
+
+
+TTS_MODEL = "eleven_multilingual_v2"
+TTS_OUTPUT_FORMAT = "mp3_44100_128"
+VOICE_SETTINGS = {
+    "stability": 0.4,
+    "similarity_boost": 0.8,
+    "style": 0.2,
+    "use_speaker_boost": True
+}
+
+_eleven = None
+
+
+def get_eleven():
+    """Shared ElevenLabs client; the SDK is imported on first use."""
+    global _eleven
+    if _eleven is None:
+        from elevenlabs.client import ElevenLabs
+
+        _eleven = ElevenLabs(api_key=ELEVAN_LABS_API_KEY)
+    return _eleven
+
+
+def speech_key(text: str) -> str:
+    return tts_key(text, GIRL_VOICE_ID, TTS_MODEL, TTS_OUTPUT_FORMAT, VOICE_SETTINGS)
+
+
+def tts_stream(text: str) -> Iterator[bytes]:
+    """Blocking ElevenLabs stream of mp3 chunks."""
+    from elevenlabs import VoiceSettings
+    from elevenlabs.core.api_error import ApiError
 
-def text_to_speech_elevenlabs(text: str) -> bytes:
     try:
-        audio_stream = eleven.text_to_speech.stream(
+        audio_stream = get_eleven().text_to_speech.stream(
             text=text,
             voice_id=GIRL_VOICE_ID,
-            model_id="eleven_multilingual_v2",
-            output_format="mp3_44100_128",
-            voice_settings=VoiceSettings(
-                stability=0.4,
-                similarity_boost=0.8,
-                style=0.2,
-                use_speaker_boost=True
-            )
+            model_id=TTS_MODEL,
+            output_format=TTS_OUTPUT_FORMAT,
+            voice_settings=VoiceSettings(**VOICE_SETTINGS)
         )
 
-        return b"".join(chunk for chunk in audio_stream if isinstance(chunk, bytes))
+        for chunk in audio_stream:
+            if isinstance(chunk, bytes):
+                yield chunk
 
     except ApiError as e:
         raise RuntimeError("Text-to-speech conversion failed due to quota or API error.") from e
+
+
+def text_to_speech_elevenlabs(text: str) -> bytes:
+    return b"".join(tts_stream(text))
+
+
+async def text_to_speech_cached(text: str) -> bytes:
+    key = speech_key(text)
+    audio = await tts_cache.get(key)
+    if audio is None:
+        get_eleven()  # import the SDK here, not on the worker thread
+        with stage("tts"):
+            audio = await asyncio.to_thread(text_to_speech_elevenlabs, text)
+        await tts_cache.set(key, audio, text)
+    return audio
+
+
+async def synthesize_speech(text: str) -> AsyncIterator[bytes]:
+    """Audio for one sentence: cached in one piece, otherwise streamed from ElevenLabs and then cached."""
+    key = speech_key(text)
+    audio = await tts_cache.get(key)
+    if audio is not None:
+        yield audio
+        return
+
+    get_eleven()
+    chunks = []
+    with stage("tts_sentence"):
+        async for chunk in iterate_in_thread(lambda: tts_stream(text)):
+            chunks.append(chunk)
+            yield chunk
+    await tts_cache.set(key, b"".join(chunks), text)
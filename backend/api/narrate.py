@@ -1,62 +1,249 @@
-from typing import Tuple
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Tuple
 from fastapi import APIRouter
-from motor.motor_asyncio import AsyncIOMotorClient
 from bson.binary import Binary
+from cachetools import TTLCache
+import asyncio
 import base64
-import os
-from dotenv import load_dotenv
+import time
 
-load_dotenv()
+from api.byte_cache import ByteLRUCache
+from api.metrics import stage
+from api.mongo import get_collection
+from config.settings import NARRATION_CACHE_BYTES, NARRATION_MAX_SESSIONS, NARRATION_SESSION_TTL_SECONDS
 
 router = APIRouter()
 
-client = AsyncIOMotorClient(os.getenv("MONGODB_URI"))
-db = client["shashwat"]
-collection = db["audio_clips"]
+# Clips may be added while the server runs, so timelines are reloaded now and then.
+TIMELINE_TTL_SECONDS = 300
 
-last_cached: dict[str, Tuple[str, int, int, int, bytes]] = {}
+_indexed = False
 
-async def get_narration_audio(monument_name: str, timestamp: int) -> Tuple[str, bytes]:
-    global last_cached
 
+def _clips():
+    collection = get_collection("audio_clips")
+    if collection is None:
+        raise RuntimeError("MONGODB_URI not set")
+    return collection
 
-    if monument_name in last_cached:
-        last_clip_id, last_ts, cached_start, cached_end, cached_audio = last_cached[monument_name]
-        if cached_start <= timestamp < cached_end and timestamp != last_ts:
-            return None, None
 
+async def ensure_indexes():
+    """Compound index that serves both the timeline load and the point-in-time query."""
+    global _indexed
+    if not _indexed:
+        await _clips().create_index([("monument", 1), ("start_time", 1), ("end_time", 1)])
+        _indexed = True
 
-    cursor = collection.find({"monument": monument_name})
-    docs = await cursor.to_list(length=None)
 
-    for doc in docs:
-        start, end = doc.get("start_time"), doc.get("end_time")
-        if start is None or end is None:
-            continue
+class ClipTimeline:
+    """Sorted, non-overlapping [start, end) intervals for one monument, without the audio."""
 
-        if start <= timestamp < end:
-            clip_id = f"{start}-{end}"
+    def __init__(self, clips: List[Dict[str, Any]]):
+        clips = sorted(clips, key=lambda c: c["start_time"])
+        self.starts = [c["start_time"] for c in clips]
+        self.ends = [c["end_time"] for c in clips]
+        self.ids = [c["_id"] for c in clips]
+        self.loaded_at = time.monotonic()
 
-            if monument_name in last_cached and last_cached[monument_name][0] == clip_id:
-                return None, None
+    def find(self, timestamp: int) -> Optional[int]:
+        i = bisect_right(self.starts, timestamp) - 1
+        if i >= 0 and timestamp < self.ends[i]:
+            return i
+        return None
 
-            audio_binary = doc.get("audio")
-            if not audio_binary:
-                continue
+    def clip_id(self, i: int) -> str:
+        return f"{self.starts[i]}-{self.ends[i]}"
 
-            if isinstance(audio_binary, Binary):
-                audio_data = bytes(audio_binary)
-            elif isinstance(audio_binary, bytes):
-                audio_data = audio_binary
-            elif isinstance(audio_binary, str):
-                try:
-                    audio_data = base64.b64decode(audio_binary)
-                except Exception as e:
-                    continue
-            else:
-                continue
+    def meta(self, i: int) -> Dict[str, Any]:
+        return {"_id": self.ids[i], "start_time": self.starts[i], "end_time": self.ends[i]}
 
-            last_cached[monument_name] = (clip_id, timestamp, start, end, audio_data)
+    def next_after(self, start_time: int) -> Optional[Dict[str, Any]]:
+        i = bisect_right(self.starts, start_time)
+        return self.meta(i) if i < len(self.starts) else None
+
+    def is_stale(self) -> bool:
+        return time.monotonic() - self.loaded_at > TIMELINE_TTL_SECONDS
+
+
+_timelines: Dict[str, ClipTimeline] = {}
+
+_VALID_RANGE = {"start_time": {"$ne": None}, "end_time": {"$ne": None}}
+
+
+async def load_timeline(monument_name: str) -> ClipTimeline:
+    await ensure_indexes()
+    cursor = _clips().find(
+        {"monument": monument_name, **_VALID_RANGE},
+        projection={"start_time": 1, "end_time": 1},
+    )
+    with stage("mongo_timeline_load"):
+        timeline = ClipTimeline(await cursor.to_list(length=None))
+    _timelines[monument_name] = timeline
+    return timeline
+
+
+async def get_timeline(monument_name: str) -> ClipTimeline:
+    timeline = _timelines.get(monument_name)
+    if timeline is None or timeline.is_stale():
+        timeline = await load_timeline(monument_name)
+    return timeline
+
+
+async def find_clip(monument_name: str, timestamp: int) -> Optional[Dict[str, Any]]:
+    """Clip metadata covering `timestamp`: in-memory bisect first, indexed Mongo query on a miss."""
+    timeline = await get_timeline(monument_name)
+    i = timeline.find(timestamp)
+    if i is not None:
+        return timeline.meta(i)
+
+    doc = await _clips().find_one(
+        {"monument": monument_name, "start_time": {"$lte": timestamp}, "end_time": {"$gt": timestamp}},
+        projection={"start_time": 1, "end_time": 1},
+        sort=[("start_time", -1)],
+    )
+    if doc is not None:
+        # The clip was added after the timeline was loaded.
+        _timelines.pop(monument_name, None)
+    return doc
+
+
+def _audio_bytes(audio_binary) -> Optional[bytes]:
+    if isinstance(audio_binary, Binary):
+        return bytes(audio_binary)
+    if isinstance(audio_binary, bytes):
+        return audio_binary
+    if isinstance(audio_binary, str):
+        try:
+            return base64.b64decode(audio_binary)
+        except Exception:
+            return None
+    return None
+
+
+async def fetch_clip_audio(doc_id) -> Optional[bytes]:
+    with stage("mongo_clip_fetch"):
+        doc = await _clips().find_one({"_id": doc_id}, projection={"audio": 1})
+    if not doc or not doc.get("audio"):
+        return None
+    return _audio_bytes(doc["audio"])
+
+
+# (monument, clip_id) -> mp3 bytes
+audio_cache = ByteLRUCache(NARRATION_CACHE_BYTES)
+
+# In-flight prefetches; holding the task also keeps it from being garbage collected.
+_prefetching: Dict[Tuple[str, str], asyncio.Task] = {}
+
+
+def _clip_key(monument_name: str, clip: Dict[str, Any]) -> Tuple[str, str]:
+    return monument_name, f"{clip['start_time']}-{clip['end_time']}"
+
+
+async def get_clip_audio(monument_name: str, clip: Dict[str, Any]) -> Optional[bytes]:
+    key = _clip_key(monument_name, clip)
+    audio_data = audio_cache.get(key)
+    if audio_data is None:
+        audio_data = await fetch_clip_audio(clip["_id"])
+        if audio_data:
+            audio_cache.set(key, audio_data)
+    return audio_data
+
+
+async def _prefetch(monument_name: str, clip: Dict[str, Any]):
+    key = _clip_key(monument_name, clip)
+    try:
+        audio_data = await fetch_clip_audio(clip["_id"])
+        if audio_data:
+            audio_cache.set(key, audio_data)
+    except Exception:
+        pass  # best effort; the clip is fetched on demand if this fails
+    finally:
+        _prefetching.pop(key, None)
+
+
+def prefetch_next_clip(monument_name: str, clip: Dict[str, Any]):
+    """Start loading the clip after `clip` in the background while the current one plays."""
+    timeline = _timelines.get(monument_name)
+    nxt = timeline.next_after(clip["start_time"]) if timeline else None
+    if nxt is None:
+        return
+    key = _clip_key(monument_name, nxt)
+    if key in audio_cache or key in _prefetching:
+        return
+    _prefetching[key] = asyncio.create_task(_prefetch(monument_name, nxt))
+
+
+async def warm_up(monuments: List[str]):
+    """Load the timelines and every clip of the given monuments into memory."""
+    for monument_name in monuments:
+        try:
+            timeline = await load_timeline(monument_name)
+            cursor = _clips().find(
+                {"monument": monument_name, **_VALID_RANGE},
+                projection={"audio": 1, "start_time": 1, "end_time": 1},
+            )
+            for doc in await cursor.to_list(length=None):
+                audio_data = _audio_bytes(doc.get("audio"))
+                if audio_data:
+                    audio_cache.set(_clip_key(monument_name, doc), audio_data)
+            print(f"Narration warm-up: {monument_name}, {len(timeline.ids)} clips")
+        except Exception as e:
+            print(f"Narration warm-up failed for {monument_name}: {e}")
+
+
+async def get_clip_audio_by_id(monument_name: str, clip_id: str) -> Optional[bytes]:
+    """Audio for a clip id of the form '<start>-<end>', as handed out by the narrate endpoint.
+
+    Ids are compared as strings, exactly as they were built, so float times ('20.0-30.0') work too.
+    """
+    key = (monument_name, clip_id)
+    audio_data = audio_cache.get(key)
+    if audio_data is not None:
+        return audio_data
+
+    try:
+        start = float(clip_id.split("-", 1)[0])
+    except ValueError:
+        return None
+
+    clip = await find_clip(monument_name, start)
+    if clip is None or _clip_key(monument_name, clip)[1] != clip_id:
+        return None
+    return await get_clip_audio(monument_name, clip)
+
+
+class PlaybackTracker:
+    """Last clip sent to each (session, monument), bounded in count and expiring when idle."""
+
+    def __init__(self, max_sessions: int = NARRATION_MAX_SESSIONS, ttl: int = NARRATION_SESSION_TTL_SECONDS):
+        self.playing: TTLCache = TTLCache(maxsize=max_sessions, ttl=ttl)
+
+    def current(self, session_id: str, monument_name: str) -> Optional[str]:
+        return self.playing.get((session_id, monument_name))
+
+    def update(self, session_id: str, monument_name: str, clip_id: str):
+        # Re-inserting restarts the TTL, so a session stays tracked while it keeps polling.
+        self.playing.pop((session_id, monument_name), None)
+        self.playing[(session_id, monument_name)] = clip_id
+
+
+playback = PlaybackTracker()
+
+
+async def get_narration_audio(monument_name: str, timestamp: int, session_id: str) -> Tuple[str, Optional[bytes]]:
+    """Clip covering `timestamp`. Audio is None when this session is already playing that clip."""
+    clip = await find_clip(monument_name, timestamp)
+    if clip is not None:
+        clip_id = f"{clip['start_time']}-{clip['end_time']}"
+
+        if playback.current(session_id, monument_name) == clip_id:
+            playback.update(session_id, monument_name, clip_id)
+            return clip_id, None
+
+        audio_data = await get_clip_audio(monument_name, clip)
+        if audio_data:
+            playback.update(session_id, monument_name, clip_id)
+            prefetch_next_clip(monument_name, clip)
             return clip_id, audio_data
 
     raise ValueError(f"No narration found for {monument_name} at {timestamp}s")
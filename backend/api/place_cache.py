@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from cachetools import TTLCache
+
+from api.mongo import get_collection
+from config.settings import (
+    PLACE_CACHE_PERSIST,
+    PLACE_CACHE_SIZE,
+    PLACE_CACHE_TTL_SECONDS,
+)
+
+
+class _CountingTTLCache(TTLCache):
+    """TTLCache that counts LRU evictions (expired entries are not evictions)."""
+
+    def __init__(self, maxsize, ttl):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.evictions = 0
+
+    def popitem(self):
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+
+def _persistent_collection(name: str):
+    if not PLACE_CACHE_PERSIST:
+        return None
+    return get_collection(name)
+
+
+class PlaceCache:
+    """Two-tier cache: in-process TTL/LRU in front of an optional Mongo collection."""
+
+    def __init__(self, name: str, maxsize: int = PLACE_CACHE_SIZE, ttl: int = PLACE_CACHE_TTL_SECONDS):
+        self.name = name
+        self.ttl = ttl
+        self.memory = _CountingTTLCache(maxsize=maxsize, ttl=ttl)
+        self.collection = _persistent_collection(f"place_cache_{name}")
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self._indexed = False
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        if self.collection is not None:
+            try:
+                doc = await self.collection.find_one({"_id": key})
+            except Exception:
+                doc = None  # a cache outage costs quota, not the request
+            if doc and doc["expires_at"].replace(tzinfo=timezone.utc) > datetime.now(timezone.utc):
+                self.persistent_hits += 1
+                self.memory[key] = doc["value"]
+                return doc["value"]
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: Any):
+        self.memory[key] = value
+
+        if self.collection is None:
+            return
+
+        try:
+            if not self._indexed:
+                # Mongo drops documents on its own once expires_at has passed.
+                await self.collection.create_index("expires_at", expireAfterSeconds=0)
+                self._indexed = True
+            expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl)
+            await self.collection.replace_one(
+                {"_id": key}, {"_id": key, "value": value, "expires_at": expires_at}, upsert=True
+            )
+        except Exception:
+            pass
+
+    def clear(self):
+        self.memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.persistent_hits + self.misses
+        return {
+            "size": len(self.memory),
+            "maxsize": self.memory.maxsize,
+            "hits": self.hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "evictions": self.memory.evictions,
+            "hit_rate": (self.hits + self.persistent_hits) / lookups if lookups else 0.0,
+            "persistent": self.collection is not None,
+        }
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def details_key(place_id: str, fields: str) -> str:
+    return f"{place_id}|{','.join(sorted(fields.split(',')))}"
+
+
+details_cache = PlaceCache("details")
+search_cache = PlaceCache("search")
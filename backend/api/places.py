@@ -0,0 +1,144 @@
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from api.place_cache import details_cache, details_key, normalize_query, search_cache
+from api.metrics import stage
+from api.upstream import UpstreamError, google_maps
+from config.settings import (
+    PLACES_CITY_CONCURRENCY,
+    PLACES_DETAILS_CONCURRENCY,
+)
+
+DETAIL_FIELDS = "name,formatted_address,opening_hours,website,rating,photos,geometry"
+PHOTO_URL = "https://maps.googleapis.com/maps/api/place/photo?maxwidth=400&photoreference={ref}&key={key}"
+
+MIN_RATING = 3.8
+MIN_RATINGS_TOTAL = 300
+RESULTS_PER_CITY = 10
+
+MONUMENT_QUERY = "monuments, historical landmarks, tourist attractions, and places to visit in {city}"
+FULL_DAY_QUERY = "full day attractions, theme parks, film cities, resorts, and amusement parks in {city}"
+
+
+def qualifies(place: Dict[str, Any]) -> bool:
+    return place.get("rating", 0.0) >= MIN_RATING and place.get("user_ratings_total", 0) >= MIN_RATINGS_TOTAL
+
+
+async def text_search(query: str, key: str, use_cache: bool = True) -> List[Dict[str, Any]]:
+    cache_key = normalize_query(query)
+    cached = await search_cache.get(cache_key) if use_cache else None
+    if cached is not None:
+        return cached
+
+    with stage("places_search"):
+        data = await google_maps.get_json("textsearch", {"query": query, "key": key})
+    results = data.get("results", [])
+    if data.get("status") in ("OK", "ZERO_RESULTS"):
+        await search_cache.set(cache_key, results)
+    return results
+
+
+async def place_details(place_id: str, key: str, use_cache: bool = True) -> Dict[str, Any]:
+    cache_key = details_key(place_id, DETAIL_FIELDS)
+    cached = await details_cache.get(cache_key) if use_cache else None
+    if cached is not None:
+        return cached
+
+    params = {"place_id": place_id, "fields": DETAIL_FIELDS, "key": key}
+    with stage("places_details"):
+        result = (await google_maps.get_json("details", params)).get("result", {})
+    if result:
+        await details_cache.set(cache_key, result)
+    return result
+
+
+async def fetch_city_places(
+    cities: List[str],
+    query_template: str,
+    key: str,
+    is_duplicate: Callable[[str], bool],
+    cataloged: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """Search every city, then fetch details for the surviving places concurrently.
+
+    Cities in `cataloged` (city -> precomputed details, see api.catalog) skip both calls.
+    Returns (city, details) pairs in city order, so callers can hand out ids
+    exactly as the serial implementation did.
+    """
+    cataloged = cataloged or {}
+    city_sem = asyncio.Semaphore(PLACES_CITY_CONCURRENCY)
+    details_sem = asyncio.Semaphore(PLACES_DETAILS_CONCURRENCY)
+
+    async def search(city: str):
+        async with city_sem:
+            try:
+                return await text_search(query_template.format(city=city), key)
+            except UpstreamError as e:
+                print(f"Places search failed for {city}: {e}")
+                return []
+
+    async def details(place_id: str):
+        async with details_sem:
+            try:
+                return await place_details(place_id, key)
+            except UpstreamError as e:
+                print(f"Place details failed for {place_id}: {e}")
+                return None
+
+    async def ready(result: Dict[str, Any]):
+        return result
+
+    live = [city for city in cities if city not in cataloged]
+    searches = dict(zip(live, await asyncio.gather(*(search(city) for city in live))))
+
+    # Dedup and filtering stay sequential so results don't depend on timing.
+    candidates: List[Tuple[str, str, Optional[Dict[str, Any]]]] = []
+    for city in cities:
+        if city in cataloged:
+            for result in cataloged[city]:
+                if not is_duplicate(result["place_id"]):
+                    candidates.append((city, result["place_id"], result))
+            continue
+        for place in searches[city][:RESULTS_PER_CITY]:
+            place_id = place.get("place_id")
+            if is_duplicate(place_id):
+                continue
+            if not qualifies(place):
+                continue
+            candidates.append((city, place_id, None))
+
+    results = await asyncio.gather(
+        *(details(place_id) if known is None else ready(known) for _, place_id, known in candidates)
+    )
+    return [(city, result) for (city, _, _), result in zip(candidates, results) if result is not None]
+
+
+def build_place_entry(
+    details: Dict[str, Any],
+    entry_id: int,
+    city: str,
+    key: str,
+    default_name: str,
+    default_description: str,
+) -> Dict[str, Any]:
+    location = details.get("geometry", {}).get("location", {})
+    entry = {
+        "id": entry_id,
+        "name": details.get("name", default_name),
+        "city": city,
+        "state": "",
+        "rating": details.get("rating", 0.0),
+        "description": details.get("formatted_address", default_description),
+        "formatted_address": details.get("formatted_address"),
+        "website": details.get("website"),
+        "opening_hours": details.get("opening_hours", {}).get("weekday_text", []),
+        "photo_url": None,
+        "lat": location.get("lat"),
+        "lng": location.get("lng"),
+    }
+
+    if "photos" in details:
+        ref = details["photos"][0]["photo_reference"]
+        entry["photo_url"] = PHOTO_URL.format(ref=ref, key=key)
+
+    return entry
@@ -1,68 +1,169 @@
-from fastapi import APIRouter, UploadFile, File, Form
-from fastapi.responses import JSONResponse
-from api.monument_qa import answer_query
-from api.narrate import get_narration_audio
+from fastapi import APIRouter, UploadFile, File, Form, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from api.byte_ranges import IMMUTABLE, bytes_response, content_etag, etag_matches, not_modified
+from api.frames import FrameTooLarge, InvalidFrame, read_upload
+from api.monument_qa import answer_query, stream_answer_audio
+from api.narrate import get_clip_audio_by_id, get_narration_audio
+from api.tts_cache import tts_cache
 from pydantic import BaseModel
-from typing import Optional
+from typing import Literal, Optional
 import base64
 
 router = APIRouter()
 
+AUDIO_MIME = "audio/mpeg"
+
+MONUMENT_SLUGS = {
+    "hawa mahal": "hawa_mahal",
+    "taj mahal": "taj_mahal",
+    "red fort": "red_fort"
+}
+
+
+def monument_slug(name: str) -> str:
+    name = name.strip().lower()
+    return MONUMENT_SLUGS.get(name, name)
+
+
 @router.post("/virtual-tour/ask")
 async def ask_virtual_tour(
     image: UploadFile = File(...),
     question: str = Form(...),
-    monument: str = Form(...)
+    monument: str = Form(...),
+    audio_format: Literal["base64", "url"] = Form("base64")
 ):
-    image_bytes = await image.read()
+    try:
+        image_bytes = await read_upload(image)
+    except FrameTooLarge as e:
+        return JSONResponse({"error": str(e)}, status_code=413)
 
-    result = await answer_query(
-        image_bytes=image_bytes,
-        user_question=question,
-        monument_name=monument
-    )
+    try:
+        result = await answer_query(
+            image_bytes=image_bytes,
+            user_question=question,
+            monument_name=monument
+        )
+    except FrameTooLarge as e:
+        return JSONResponse({"error": str(e)}, status_code=413)
+    except InvalidFrame as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
 
-    audio_base64 = base64.b64encode(result["audio"]).decode("utf-8")
+    # The TTS cache key: the audio is already stored under it, in memory and in Mongo.
+    answer_id = result["audio_key"]
 
-    return JSONResponse({
+    payload = {
         "answer": result["answer"],
-        "audio_base64": audio_base64,
-        "audio_mime": "audio/mpeg"
-    })
+        "answer_id": answer_id,
+        "audio_url": f"/virtual-tour/answers/{answer_id}/audio",
+        "audio_mime": AUDIO_MIME
+    }
+    if audio_format == "base64":
+        payload["audio_base64"] = base64.b64encode(result["audio"]).decode("utf-8")
+
+    return JSONResponse(payload)
+
+
+@router.post("/virtual-tour/ask/stream")
+async def ask_virtual_tour_stream(
+    image: UploadFile = File(...),
+    question: str = Form(...),
+    monument: str = Form(...)
+):
+    """Chunked audio/mpeg: the first sentence starts playing while the rest is still being generated."""
+    try:
+        image_bytes = await read_upload(image)
+    except FrameTooLarge as e:
+        return JSONResponse({"error": str(e)}, status_code=413)
+
+    try:
+        audio_chunks = await stream_answer_audio(
+            image_bytes=image_bytes,
+            user_question=question,
+            monument_name=monument
+        )
+    except FrameTooLarge as e:
+        return JSONResponse({"error": str(e)}, status_code=413)
+    except InvalidFrame as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+
+    return StreamingResponse(audio_chunks, media_type=AUDIO_MIME, headers={"Cache-Control": "no-store"})
+
+
+@router.get("/virtual-tour/answers/{answer_id}/audio")
+async def get_answer_audio(answer_id: str, request: Request):
+    """Answer audio from the TTS cache, so any worker can serve it while the Mongo tier keeps it.
+
+    The id names the text, not the bytes: once the entry expires the same text is synthesized
+    again into different audio. The ETag is therefore a hash of the bytes actually served, so
+    If-Range can never splice two syntheses together.
+    """
+    audio_bytes = await tts_cache.get(answer_id)
+    if audio_bytes is None:
+        return JSONResponse({"error": "Answer audio expired or not found"}, status_code=404)
+    return bytes_response(request, audio_bytes, AUDIO_MIME, etag=content_etag(audio_bytes), cache_control=IMMUTABLE)
+
+
+@router.get("/virtual-tour/tts/cache-stats")
+async def tts_cache_stats():
+    return tts_cache.stats()
 
 
 class NarrateRequest(BaseModel):
     monument: str
     timestamp: int
     source: Optional[str] = "video"
+    session_id: Optional[str] = None
+    audio_format: Literal["base64", "url"] = "base64"
 
 
 @router.post("/virtual-tour/narrate")
-async def narrate_virtual_tour(request: NarrateRequest):
+async def narrate_virtual_tour(request: NarrateRequest, http_request: Request):
 
-    monument_map = {
-        "hawa mahal": "hawa_mahal",
-        "taj mahal": "taj_mahal",
-        "red fort": "red_fort"
-    }
+    monument = monument_slug(request.monument)
 
-    monument = monument_map.get(request.monument.strip().lower(), request.monument.strip().lower())
+    # Older clients send no session id; fall back to their address so they are at least not shared.
+    session_id = request.session_id or f"ip:{http_request.client.host if http_request.client else 'unknown'}"
 
     try:
         clip_id, audio_bytes = await get_narration_audio(
             monument_name=monument,
-            timestamp=request.timestamp
+            timestamp=request.timestamp,
+            session_id=session_id
         )
 
-        audio_base64 = base64.b64encode(audio_bytes).decode("utf-8")
+        if audio_bytes is None:
+            # Still inside the clip this session is already playing.
+            return Response(status_code=204, headers={"X-Clip-Id": clip_id})
 
-        return JSONResponse({
+        payload = {
             "clip_id": clip_id,
-            "audio_base64": audio_base64,
-            "audio_mime": "audio/mpeg"
-        })
+            "audio_url": f"/virtual-tour/narrate/{monument}/clips/{clip_id}",
+            "audio_mime": AUDIO_MIME
+        }
+        if request.audio_format == "base64":
+            payload["audio_base64"] = base64.b64encode(audio_bytes).decode("utf-8")
+
+        return JSONResponse(payload)
 
     except ValueError as e:
         return JSONResponse({"error": str(e)}, status_code=404)
     except Exception as e:
         return JSONResponse({"error": f"Internal Server Error: {str(e)}"}, status_code=500)
+
+
+@router.get("/virtual-tour/narrate/{monument}/clips/{clip_id}")
+async def get_narration_clip(monument: str, clip_id: str, request: Request):
+    """Raw mp3 for one narration clip. Clips never change, so browsers and CDNs may keep them forever."""
+    monument = monument_slug(monument)
+    etag = f'"{monument}-{clip_id}"'
+    if etag_matches(request, etag):
+        return not_modified(etag, IMMUTABLE)
+
+    try:
+        audio_bytes = await get_clip_audio_by_id(monument, clip_id)
+    except Exception as e:
+        return JSONResponse({"error": f"Internal Server Error: {str(e)}"}, status_code=500)
+
+    if audio_bytes is None:
+        return JSONResponse({"error": f"No clip {clip_id} for {monument}"}, status_code=404)
+    return bytes_response(request, audio_bytes, AUDIO_MIME, etag=etag, cache_control=IMMUTABLE)
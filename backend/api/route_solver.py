@@ -0,0 +1,153 @@
+from typing import List
+
+import numpy as np
+
+# Held-Karp is exact but O(2^m * m^2) in the m free stops; past this it gets slow.
+HELD_KARP_MAX_STOPS = 15
+
+
+def path_cost(dist: np.ndarray, path: List[int]) -> float:
+    return float(dist[path[:-1], path[1:]].sum())
+
+
+def held_karp_path(dist: np.ndarray) -> List[int]:
+    """Exact shortest path from node 0 to node n-1 through every other node."""
+    n = len(dist)
+    if n <= 2:
+        return list(range(n))
+
+    m = n - 2
+    inner = dist[1:-1, 1:-1]
+    from_start = dist[0, 1:-1]
+    to_end = dist[1:-1, -1]
+
+    size = 1 << m
+    cost = np.full((size, m), np.inf)
+    parent = np.full((size, m), -1, dtype=np.int8)
+    for j in range(m):
+        cost[1 << j, j] = from_start[j]
+
+    masks = np.arange(size)
+    popcount = np.zeros(size, dtype=np.int8)
+    for j in range(m):
+        popcount += (masks >> j) & 1
+
+    # Fill one subset size at a time; each step is a vectorized update over all masks of that size.
+    for count in range(2, m + 1):
+        layer = masks[popcount == count]
+        for j in range(m):
+            bit = 1 << j
+            subset = layer[(layer & bit) != 0]
+            if not len(subset):
+                continue
+            candidates = cost[subset ^ bit] + inner[:, j]
+            best = np.argmin(candidates, axis=1)
+            cost[subset, j] = candidates[np.arange(len(subset)), best]
+            parent[subset, j] = best
+
+    full = size - 1
+    last = int(np.argmin(cost[full] + to_end))
+    order = []
+    mask = full
+    while last != -1:
+        order.append(last + 1)
+        prev = int(parent[mask, last])
+        mask ^= 1 << last
+        last = prev
+    return [0] + order[::-1] + [n - 1]
+
+
+def nearest_neighbour_path(dist: np.ndarray) -> List[int]:
+    n = len(dist)
+    remaining = set(range(1, n - 1))
+    path = [0]
+    while remaining:
+        current = path[-1]
+        nxt = min(remaining, key=lambda j: dist[current, j])
+        path.append(nxt)
+        remaining.remove(nxt)
+    path.append(n - 1)
+    return path
+
+
+def two_opt(dist: np.ndarray, path: List[int]) -> List[int]:
+    """Reverse inner segments while that shortens the path; endpoints stay fixed."""
+    path = list(path)
+    n = len(path)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, n - 2):
+            a, b = path[i - 1], path[i]
+            for k in range(i + 1, n - 1):
+                c, d = path[k], path[k + 1]
+                delta = dist[a, c] + dist[b, d] - dist[a, b] - dist[c, d]
+                if delta < -1e-9:
+                    path[i:k + 1] = path[i:k + 1][::-1]
+                    b = path[i]
+                    improved = True
+    return path
+
+
+def or_opt(dist: np.ndarray, path: List[int], max_segment: int = 3) -> List[int]:
+    """Move runs of 1..max_segment inner stops to a cheaper position; endpoints stay fixed."""
+    path = list(path)
+    improved = True
+    while improved:
+        improved = False
+        for length in range(1, max_segment + 1):
+            i = 1
+            while i + length < len(path):
+                segment = path[i:i + length]
+                prev, nxt = path[i - 1], path[i + length]
+                removal_gain = dist[prev, segment[0]] + dist[segment[-1], nxt] - dist[prev, nxt]
+                rest = path[:i] + path[i + length:]
+
+                best_delta, best_pos, best_reversed = -1e-9, None, False
+                for pos in range(1, len(rest)):
+                    u, v = rest[pos - 1], rest[pos]
+                    base = dist[u, v]
+                    forward = dist[u, segment[0]] + dist[segment[-1], v] - base - removal_gain
+                    backward = dist[u, segment[-1]] + dist[segment[0], v] - base - removal_gain
+                    if forward < best_delta:
+                        best_delta, best_pos, best_reversed = forward, pos, False
+                    if backward < best_delta:
+                        best_delta, best_pos, best_reversed = backward, pos, True
+
+                if best_pos is not None:
+                    moved = segment[::-1] if best_reversed else segment
+                    path = rest[:best_pos] + moved + rest[best_pos:]
+                    improved = True
+                else:
+                    i += 1
+    return path
+
+
+def heuristic_path(dist: np.ndarray) -> List[int]:
+    """Nearest neighbour construction polished with 2-opt and Or-opt until neither helps."""
+    if len(dist) <= 2:
+        return list(range(len(dist)))
+    path = nearest_neighbour_path(dist)
+    while True:
+        before = path_cost(dist, path)
+        path = or_opt(dist, two_opt(dist, path))
+        if path_cost(dist, path) >= before - 1e-9:
+            return path
+
+
+def solve_path(dist: np.ndarray) -> List[int]:
+    """Pick the exact solver for small days and the heuristic for larger ones."""
+    if len(dist) <= HELD_KARP_MAX_STOPS:
+        return held_karp_path(dist)
+    return heuristic_path(dist)
+
+
+def solve_open_path(dist: np.ndarray) -> List[int]:
+    """Shortest path from node 0 through every other node, ending wherever is cheapest."""
+    n = len(dist)
+    if n <= 2:
+        return list(range(n))
+    # A free end is a fixed end at a dummy node that is zero km from everything.
+    padded = np.zeros((n + 1, n + 1))
+    padded[:n, :n] = dist
+    return solve_path(padded)[:-1]
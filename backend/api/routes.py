@@ -1,168 +1,144 @@
-from fastapi import APIRouter, Query, HTTPException
-from fastapi.responses import JSONResponse
-from typing import Dict,List, Any, Optional
+from fastapi import APIRouter, Depends, Header, Query, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Dict,List, Any, Literal, Optional
 from pydantic import BaseModel
-import math
-from itertools import permutations
 
 
 import numpy as np
-from sklearn.cluster import DBSCAN,KMeans
 
-import requests
 import os
+import asyncio
 import json
 import re
 
-import google.generativeai as genai
-
-from config.settings import GOOGLE_API_KEY_CITY, GOOGLE_API_KEY_MONUMENT, GOOGLE_GEMINI_API_KEY, GOOGLE_ITENARY_API_KEY
-
-from api.dedup import is_duplicate, clear_duplicates
+from config.settings import GOOGLE_API_KEY_CITY, GOOGLE_API_KEY_MONUMENT, GOOGLE_GEMINI_API_KEY, GOOGLE_ITENARY_API_KEY, OUTLIER_PARALLEL_THRESHOLD, ITINERARY_CONCURRENCY, CITY_ORDER_LLM_FALLBACK
+
+from api.dedup import DedupContext, get_dedup_context, reset_session
+from api.places import FULL_DAY_QUERY, MONUMENT_QUERY, fetch_city_places, build_place_entry
+from api.catalog import catalog
+from api.spatial import spatial_indexes
+from api.upstream import UpstreamError, google_maps
+from api.directions import directions_cache, fetch_routes
+from api.place_cache import details_cache, search_cache
+from api.geo import coords_of, mean_distance_to_others, pairwise_km, local_xy_km
+from api.route_solver import solve_path
+from api.clustering import balanced_labels, intra_cluster_km
+from api.llm_cache import cache_key, city_set_key, llm_cache
+from api.city_order import order_cities_locally, resolve_cities
+from api.metrics import stage
+from api.gemini import gemini_model
 
 router = APIRouter()
 
 
 @router.get("/api/monuments")
-def get_monuments(cities: list[str] = Query(...)):
+async def get_monuments(cities: list[str] = Query(...), dedup: DedupContext = Depends(get_dedup_context)):
     key = GOOGLE_API_KEY_MONUMENT
     if not key:
         return {"error": "Google API key not found"}
 
-    results = []
-    id_counter = 1
-
-    for city in cities:
-        query = f"monuments, historical landmarks, tourist attractions, and places to visit in {city}"
-        search_url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
-        search_params = {"query": query, "key": key}
-        search_res = requests.get(search_url, params=search_params).json()
-
-        for place in search_res.get("results", [])[:10]:
-            place_id = place.get("place_id")
-            if is_duplicate(place_id):
-                continue
-            if place.get("rating", 0.0) < 3.8 or place.get("user_ratings_total", 0) < 300:
-                continue
-
-            detail_url = "https://maps.googleapis.com/maps/api/place/details/json"
-            detail_params = {
-                "place_id": place_id,
-                "fields": "name,formatted_address,opening_hours,website,rating,photos,geometry",
-                "key": key
-            }
-            details = requests.get(detail_url, params=detail_params).json().get("result", {})
-
-            monument = {
-                "id": id_counter,
-                "name": details.get("name", "Unknown"),
-                "city": city.strip(", "),
-                "state": "",
-                "rating": details.get("rating", 0.0),
-                "description": details.get("formatted_address", "A popular monument."),
-                "formatted_address": details.get("formatted_address"),
-                "website": details.get("website"),
-                "opening_hours": details.get("opening_hours", {}).get("weekday_text", []),
-                "photo_url": None,
-                "lat": details.get("geometry", {}).get("location", {}).get("lat"),
-                "lng": details.get("geometry", {}).get("location", {}).get("lng")
-            }
-
-            if "photos" in details:
-                ref = details["photos"][0]["photo_reference"]
-                monument["photo_url"] = f"https://maps.googleapis.com/maps/api/place/photo?maxwidth=400&photoreference={ref}&key={key}"
+    places = await fetch_city_places(cities, MONUMENT_QUERY, key, dedup.is_duplicate, catalog.lookup("monuments", cities))
 
-            results.append(monument)
-            id_counter += 1
+    results = [
+        build_place_entry(details, id_counter, city.strip(", "), key, "Unknown", "A popular monument.")
+        for id_counter, (city, details) in enumerate(places, start=1)
+    ]
+    spatial_indexes["monuments"].insert(results)
 
     return {"results": results}
 
 
 @router.get("/api/full-day")
-def get_full_day_activities(cities: list[str] = Query(...)):
+async def get_full_day_activities(cities: list[str] = Query(...), dedup: DedupContext = Depends(get_dedup_context)):
     key = GOOGLE_API_KEY_MONUMENT
     if not key:
         return {"error": "Google API key for full-day not configured."}
 
-    activities = []
-    id_counter = 1000
-
-    for city in cities:
-        query = f"full day attractions, theme parks, film cities, resorts, and amusement parks in {city}"
-        url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
-        resp = requests.get(url, params={"query": query, "key": key}).json()
-
-        for place in resp.get("results", [])[:10]:
-            place_id = place.get("place_id")
-            if is_duplicate(place_id):
-                continue
-            if place.get("rating", 0.0) < 3.8 or place.get("user_ratings_total", 0) < 300:
-                continue
-
-            detail_url = "https://maps.googleapis.com/maps/api/place/details/json"
-            detail_params = {
-                "place_id": place_id,
-                "fields": "name,formatted_address,opening_hours,website,rating,photos,geometry",
-                "key": key
-            }
-            details = requests.get(detail_url, params=detail_params).json().get("result", {})
-
-            experience = {
-                "id": id_counter,
-                "name": details.get("name", "Unknown Experience"),
-                "city": city.strip(","),
-                "state": "",
-                "rating": details.get("rating", 0.0),
-                "description": details.get("formatted_address", "A full-day activity."),
-                "formatted_address": details.get("formatted_address"),
-                "website": details.get("website"),
-                "opening_hours": details.get("opening_hours", {}).get("weekday_text", []),
-                "photo_url": None,
-                "lat": details.get("geometry", {}).get("location", {}).get("lat"),
-                "lng": details.get("geometry", {}).get("location", {}).get("lng")
-            }
+    places = await fetch_city_places(cities, FULL_DAY_QUERY, key, dedup.is_duplicate, catalog.lookup("full_day", cities))
 
-            if "photos" in details:
-                ref = details["photos"][0]["photo_reference"]
-                experience["photo_url"] = f"https://maps.googleapis.com/maps/api/place/photo?maxwidth=400&photoreference={ref}&key={key}"
-
-            activities.append(experience)
-            id_counter += 1
+    activities = [
+        build_place_entry(details, id_counter, city.strip(","), key, "Unknown Experience", "A full-day activity.")
+        for id_counter, (city, details) in enumerate(places, start=1000)
+    ]
+    spatial_indexes["full_day"].insert(activities)
 
     return {"activities": activities}
 
 
+@router.get("/api/monuments/nearby")
+async def get_nearby_places(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius_km: Optional[float] = Query(None, gt=0),
+    k: int = Query(10, ge=1, le=100),
+    kind: Literal["monuments", "full_day"] = "monuments",
+):
+    """Known places nearest to a point: the `k` closest, or up to `k` within `radius_km`."""
+    # async on purpose: the index is only ever touched from the event loop.
+    return {"results": spatial_indexes[kind].nearest(lat, lng, k, radius_km)}
+
+
 @router.post("/api/reset-monuments")
-def reset_monument_cache():
-    clear_duplicates()
+def reset_monument_cache(x_session_id: Optional[str] = Header(None), session_id: Optional[str] = Query(None)):
+    reset_session(x_session_id or session_id)
     return {"status": "cleared"}
 
 
+@router.get("/api/places/cache-stats")
+def get_place_cache_stats():
+    return {
+        "details": details_cache.stats(),
+        "search": search_cache.stats(),
+        "directions": directions_cache.stats(),
+        "catalog": catalog.stats(),
+        "spatial": {kind: index.stats() for kind, index in spatial_indexes.items()},
+    }
+
+
+@router.get("/api/llm/cache-stats")
+def get_llm_cache_stats():
+    return llm_cache.stats()
+
+
+@router.get("/api/upstream/stats")
+def get_upstream_stats():
+    return {"google_maps": google_maps.stats()}
+
+
 
 @router.get("/api/cities")
-def get_cities(state: str):
+async def get_cities(state: str):
     if not GOOGLE_API_KEY_CITY:
         return {"error": "Google API key for cities not configured."}
 
     query = f"cities in {state} India"
-    url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
     params = {
         "query": query,
         "key": GOOGLE_API_KEY_CITY
     }
 
-    response = requests.get(url, params=params)
-    return response.json() if response.status_code == 200 else {"error": "Failed to fetch data"}
+    try:
+        return await google_maps.get_json("textsearch", params)
+    except UpstreamError:
+        return {"error": "Failed to fetch data"}
 
 
 
 
-genai.configure(api_key=GOOGLE_GEMINI_API_KEY) # type: ignore
+CITY_ORDER_MODEL = "gemini-2.5-flash-lite-preview-06-17"
 
-@router.get("/api/city-order")
-def get_city_order(cities: list[str] = Query(...)):
-    if not cities:
-        raise HTTPException(status_code=400, detail="No cities provided.")
+
+def _match_city_names(ordered: List[str], cities: List[str]) -> List[str]:
+    """Map a cached order back onto the caller's spelling of each city."""
+    spelling = {" ".join(city.lower().split()): city for city in cities}
+    return [spelling.get(" ".join(name.lower().split()), name) for name in ordered]
+
+
+async def llm_city_order(cities: List[str]) -> List[str]:
+    key = city_set_key(CITY_ORDER_MODEL, cities)
+    cached = await llm_cache.get("city-order", key)
+    if cached is not None:
+        return _match_city_names(cached, cities)
 
     prompt = (
         f"You are a travel planner. Given this list of cities: {', '.join(cities)}.\n"
@@ -173,9 +149,9 @@ def get_city_order(cities: list[str] = Query(...)):
     )
 
     try:
-        
-        model = genai.GenerativeModel("gemini-2.5-flash-lite-preview-06-17")  # type: ignore
-        response = model.generate_content(prompt)
+        model = gemini_model(CITY_ORDER_MODEL, GOOGLE_GEMINI_API_KEY)
+        with stage("gemini_city_order"):
+            response = await model.generate_content_async(prompt)
         content = response.text.strip()
 
         try:
@@ -187,10 +163,29 @@ def get_city_order(cities: list[str] = Query(...)):
             else:
                 raise HTTPException(status_code=500, detail="Could not extract valid JSON array from Gemini response.")
 
-        return JSONResponse({"orderedCities": ordered})
+        await llm_cache.set(key, ordered)
+        return ordered
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gemini error: {str(e)}")
+
+
+@router.get("/api/city-order")
+async def get_city_order(cities: list[str] = Query(...)):
+    if not cities:
+        raise HTTPException(status_code=400, detail="No cities provided.")
+
+    entries, unknown = await resolve_cities(cities)
+
+    if not unknown:
+        return JSONResponse({"orderedCities": order_cities_locally(cities, entries), "source": "local"})
+
+    if not CITY_ORDER_LLM_FALLBACK:
+        known = [(city, entry) for city, entry in zip(cities, entries) if entry is not None]
+        ordered = order_cities_locally([c for c, _ in known], [e for _, e in known]) + unknown
+        return JSONResponse({"orderedCities": ordered, "source": "local"})
+
+    return JSONResponse({"orderedCities": await llm_city_order(cities), "source": "llm"})
     
 
 #-----------------------------------------------------------------------------------------------------------------------------------#
@@ -211,9 +206,36 @@ class OutlierRequest(BaseModel):
     interCityMap: List[int]
     orderedCities: List[str]
 
+def split_outliers(monuments_raw: List[Dict[str, Any]], count: int) -> Dict[str, List[Dict[str, Any]]]:
+    """Pick `count` outliers: DBSCAN noise points first, then the monuments farthest from the rest."""
+    from sklearn.cluster import DBSCAN
+
+    dist = pairwise_km(coords_of(monuments_raw), cache=False)
+    with stage("dbscan"):
+        labels = DBSCAN(eps=2.0, min_samples=2, metric='precomputed').fit_predict(dist)
+
+    outlier_idx = np.flatnonzero(labels == -1)[:count]
+
+    if len(outlier_idx) < count:
+        avg_dist = mean_distance_to_others(dist)
+        avg_dist[outlier_idx] = -np.inf
+        farthest = np.argsort(-avg_dist, kind="stable")[:count - len(outlier_idx)]
+        outlier_idx = np.concatenate([outlier_idx, farthest])
+
+    outliers = [monuments_raw[i] for i in outlier_idx]
+    outlier_ids = {m.get("id", int(i)) for m, i in zip(outliers, outlier_idx)}
+    filtered = [m for i, m in enumerate(monuments_raw) if m.get("id", i) not in outlier_ids]
+
+    return {
+        "monuments": filtered,
+        "outliers": outliers
+    }
+
+
 @router.post("/api/compute-outliers")
 async def compute_outliers(data: OutlierRequest):
     updated = {}
+    pending = {}
 
     for idx, city in enumerate(data.orderedCities):
         city_data = data.cityWiseSelection.get(city)
@@ -234,33 +256,20 @@ async def compute_outliers(data: OutlierRequest):
             }
             continue
 
-        coords = np.radians([[m["lat"], m["lng"]] for m in monuments_raw])
-        kms_per_radian = 6371.0088
-        db = DBSCAN(eps=2.0 / kms_per_radian, min_samples=2, algorithm='ball_tree', metric='haversine')
-        labels = db.fit_predict(coords)
-
-        raw_outliers = [m for i, m in enumerate(monuments_raw) if labels[i] == -1]
-        outliers = raw_outliers[:count]
-
-        def avg_dist(mon):
-            return np.mean([
-                np.linalg.norm(np.array([mon["lat"], mon["lng"]]) - np.array([other["lat"], other["lng"]]))
-                for other in monuments_raw if mon != other
-            ])
+        updated[city] = None  # keeps the response in orderedCities order
+        pending[city] = (monuments_raw, count)
 
-        if len(outliers) < count:
-            remaining = [m for m in monuments_raw if m not in outliers]
-            remaining.sort(key=avg_dist, reverse=True) # type: ignore
-            extra_needed = count - len(outliers)
-            outliers += remaining[:extra_needed]
+    total = sum(len(monuments_raw) for monuments_raw, _ in pending.values())
+    if total >= OUTLIER_PARALLEL_THRESHOLD:
+        import sklearn.cluster  # noqa: F401  (once, here, rather than racing in the worker threads)
 
-        filtered = [m for m in monuments_raw if m not in outliers]
-
-        updated[city] = {
-            "monuments": filtered,
-            "outliers": outliers
-        }
+        results = await asyncio.gather(
+            *(asyncio.to_thread(split_outliers, monuments_raw, count) for monuments_raw, count in pending.values())
+        )
+    else:
+        results = [split_outliers(monuments_raw, count) for monuments_raw, count in pending.values()]
 
+    updated.update(zip(pending.keys(), results))
     return updated
 
 
@@ -272,6 +281,7 @@ async def compute_outliers(data: OutlierRequest):
 class KMeansClusteringRequest(BaseModel):
     monuments: List[Monument]
     max_per_cluster: int = 4
+    mode: Literal["kmeans", "balanced"] = "kmeans"
 
 @router.post("/api/cluster-monuments")
 async def cluster_monuments(data: KMeansClusteringRequest):
@@ -279,14 +289,21 @@ async def cluster_monuments(data: KMeansClusteringRequest):
     max_per_cluster = data.max_per_cluster
 
     if not monuments:
-        return {"clusters": []}
+        return {"clusters": [], "mode": data.mode, "objective_km": 0.0}
 
-    coords = np.array([[m.lat, m.lng] for m in monuments])
+    coords = coords_of(monuments)
     num_clusters = int(np.ceil(len(monuments) / max_per_cluster))
 
     try:
-        kmeans = KMeans(n_clusters=num_clusters, random_state=42)
-        labels = kmeans.fit_predict(coords)
+        if data.mode == "balanced":
+            with stage("kmeans_balanced"):
+                labels = balanced_labels(coords, max_per_cluster)
+        else:
+            from sklearn.cluster import KMeans
+
+            with stage("kmeans"):
+                kmeans = KMeans(n_clusters=num_clusters, random_state=42)
+                labels = kmeans.fit_predict(local_xy_km(coords))
     except Exception as e:
         return {"error": f"KMeans clustering failed: {str(e)}"}
 
@@ -318,19 +335,19 @@ async def cluster_monuments(data: KMeansClusteringRequest):
         if not placed:
             final_clusters.append([mon])
 
-    return {"clusters": final_clusters}
+    objective = intra_cluster_km([coords_of(cluster) for cluster in final_clusters])
 
+    return {"clusters": final_clusters, "mode": data.mode, "objective_km": round(objective, 3)}
 
 
 
 
 
-#----------------------------------------------------Gemini-------------------------------------------------------------------------#
 
+#----------------------------------------------------Gemini-------------------------------------------------------------------------#
 
 
 
-genai.configure(api_key=GOOGLE_ITENARY_API_KEY)  # type: ignore
 
 class ItineraryDay(BaseModel):
     type: str 
@@ -340,111 +357,163 @@ class ItineraryRequest(BaseModel):
     cities: List[str]
     days: List[ItineraryDay]
 
+
+ITINERARY_MODEL = "gemini-2.5-pro"
+
+
+def build_day_prompt(day_number: int, day_info: ItineraryDay) -> str:
+    day_type = day_info.type
+    monuments = day_info.monuments
+    monuments_list = ", ".join([m["name"] for m in monuments]) or "No monuments"
+    city = monuments[0].get("city", "Unknown") if monuments else "Unknown"
+
+    if day_type == "full-day":
+        prompt = (
+            f"You are a travel assistant helping plan a full-day experience for a traveler in India.\n"
+            f"Day: {day_number}\n"
+            f"City: {city}\n"
+            f"Monument: {monuments_list}\n\n"
+            f"The traveler will spend the entire day at this single monument or park.\n"
+            f"Write a rich, immersive itinerary that:\n"
+            f"- Starts with 'Start your day at...'\n"
+            f"- Includes time-based events, exploring exhibits, food stalls, photo spots, gardens, rest areas\n"
+            f"- Mentions local tips and enjoyable moments\n\n"
+            f"Wrap your output as JSON:\n"
+            f"{{\n"
+            f"  \"day\": {day_number},\n"
+            f"  \"city\": \"{city}\",\n"
+            f"  \"plan\": \"<detailed itinerary paragraph>\"\n"
+            f"}}\n"
+            f"Only return valid JSON."
+        )
+
+    elif day_type == "monument":
+        prompt = (
+            f"You are a travel assistant creating a day's sightseeing itinerary in India.\n"
+            f"Day: {day_number}\n"
+            f"City: {city}\n"
+            f"Monuments: {monuments_list}\n\n"
+            f"Craft a flowing, engaging itinerary for the day:\n"
+            f"- Begin with 'Start your day at...'\n"
+            f"- Include realistic timings (e.g., 9:00 AM)\n"
+            f"- Add chai/snack breaks, street scenes, transport\n"
+            f"- Mention brief highlights at each monument\n\n"
+            f"Respond in valid JSON:\n"
+            f"{{\n"
+            f"  \"day\": {day_number},\n"
+            f"  \"city\": \"{city}\",\n"
+            f"  \"plan\": \"<detailed itinerary paragraph>\"\n"
+            f"}}"
+        )
+
+    elif day_type == "inter-city":
+        city_from = monuments[0].get("city", "Unknown") if len(monuments) > 0 else "Unknown"
+        city_to = monuments[1].get("city", "Unknown") if len(monuments) > 1 else "Unknown"
+        from_monument = monuments[0].get("name", "Place A") if len(monuments) > 0 else "Place A"
+        to_monument = monuments[1].get("name", "Place B") if len(monuments) > 1 else "Place B"
+
+        prompt = (
+            f"You are a travel assistant planning an inter-city journey day in India.\n"
+            f"Day: {day_number}\n"
+            f"Start City: {city_from}\n"
+            f"Destination City: {city_to}\n"
+            f"Morning Monument: {from_monument}\n"
+            f"Evening Monument: {to_monument}\n\n"
+            f"Write an itinerary that:\n"
+            f"- Begins in the origin city, visits the first monument\n"
+            f"- Mentions transport to the destination (train, car)\n"
+            f"- Includes local snacks, rest breaks\n"
+            f"- Ends with visiting the 2nd monument and settling down\n\n"
+            f"Format JSON like this:\n"
+            f"{{\n"
+            f"  \"day\": {day_number},\n"
+            f"  \"city\": \"{city_from} to {city_to}\",\n"
+            f"  \"plan\": \"<bullet-point format itinerary>\"\n"
+            f"}}"
+        )
+
+    else:
+        raise HTTPException(status_code=400, detail=f"Invalid day type '{day_type}' for day {day_number}")
+
+    return prompt
+
+
+def parse_itinerary_entry(content: str, day_number: int) -> Dict[str, Any]:
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        match = re.search(r"\{.*\}", content, re.DOTALL)
+        if match:
+            return json.loads(match.group())
+        raise HTTPException(status_code=500, detail=f"Invalid JSON for day {day_number}.")
+
+
+async def generate_day_itinerary(model, prompt: str, day_number: int, limit: asyncio.Semaphore) -> Dict[str, Any]:
+    key = cache_key(ITINERARY_MODEL, prompt)
+    cached = await llm_cache.get("itinerary", key)
+    if cached is not None:
+        return cached
+
+    async with limit:
+        with stage("gemini_itinerary"):
+            response = await model.generate_content_async(prompt)
+    entry = parse_itinerary_entry(response.text.strip(), day_number)
+    await llm_cache.set(key, entry)
+    return entry
+
+
+def start_day_tasks(days: List[ItineraryDay]) -> List["asyncio.Task"]:
+    """Validate every day up front, then run the Gemini calls concurrently."""
+    prompts = [build_day_prompt(index + 1, day_info) for index, day_info in enumerate(days)]
+    model = gemini_model(ITINERARY_MODEL, GOOGLE_ITENARY_API_KEY)
+    limit = asyncio.Semaphore(ITINERARY_CONCURRENCY)
+    return [
+        asyncio.create_task(generate_day_itinerary(model, prompt, index + 1, limit))
+        for index, prompt in enumerate(prompts)
+    ]
+
+
 @router.post("/api/generate-itinerary")
 async def generate_itinerary(data: ItineraryRequest):
-    cities = data.cities
-    days = data.days
-
-    if not cities or not days:
+    if not data.cities or not data.days:
         raise HTTPException(status_code=400, detail="Cities and day-wise data are required.")
 
+    tasks = start_day_tasks(data.days)
+
     try:
-        all_day_itineraries = []
-
-        for index, day_info in enumerate(days):
-            day_number = index + 1
-            day_type = day_info.type
-            monuments = day_info.monuments
-            monuments_list = ", ".join([m["name"] for m in monuments]) or "No monuments"
-            city = monuments[0].get("city", "Unknown") if monuments else "Unknown"
-
-            if day_type == "full-day":
-                prompt = (
-                    f"You are a travel assistant helping plan a full-day experience for a traveler in India.\n"
-                    f"Day: {day_number}\n"
-                    f"City: {city}\n"
-                    f"Monument: {monuments_list}\n\n"
-                    f"The traveler will spend the entire day at this single monument or park.\n"
-                    f"Write a rich, immersive itinerary that:\n"
-                    f"- Starts with 'Start your day at...'\n"
-                    f"- Includes time-based events, exploring exhibits, food stalls, photo spots, gardens, rest areas\n"
-                    f"- Mentions local tips and enjoyable moments\n\n"
-                    f"Wrap your output as JSON:\n"
-                    f"{{\n"
-                    f"  \"day\": {day_number},\n"
-                    f"  \"city\": \"{city}\",\n"
-                    f"  \"plan\": \"<detailed itinerary paragraph>\"\n"
-                    f"}}\n"
-                    f"Only return valid JSON."
-                )
-
-            elif day_type == "monument":
-                prompt = (
-                    f"You are a travel assistant creating a day's sightseeing itinerary in India.\n"
-                    f"Day: {day_number}\n"
-                    f"City: {city}\n"
-                    f"Monuments: {monuments_list}\n\n"
-                    f"Craft a flowing, engaging itinerary for the day:\n"
-                    f"- Begin with 'Start your day at...'\n"
-                    f"- Include realistic timings (e.g., 9:00 AM)\n"
-                    f"- Add chai/snack breaks, street scenes, transport\n"
-                    f"- Mention brief highlights at each monument\n\n"
-                    f"Respond in valid JSON:\n"
-                    f"{{\n"
-                    f"  \"day\": {day_number},\n"
-                    f"  \"city\": \"{city}\",\n"
-                    f"  \"plan\": \"<detailed itinerary paragraph>\"\n"
-                    f"}}"
-                )
-
-            elif day_type == "inter-city":
-                city_from = monuments[0].get("city", "Unknown") if len(monuments) > 0 else "Unknown"
-                city_to = monuments[1].get("city", "Unknown") if len(monuments) > 1 else "Unknown"
-                from_monument = monuments[0].get("name", "Place A") if len(monuments) > 0 else "Place A"
-                to_monument = monuments[1].get("name", "Place B") if len(monuments) > 1 else "Place B"
-
-                prompt = (
-                    f"You are a travel assistant planning an inter-city journey day in India.\n"
-                    f"Day: {day_number}\n"
-                    f"Start City: {city_from}\n"
-                    f"Destination City: {city_to}\n"
-                    f"Morning Monument: {from_monument}\n"
-                    f"Evening Monument: {to_monument}\n\n"
-                    f"Write an itinerary that:\n"
-                    f"- Begins in the origin city, visits the first monument\n"
-                    f"- Mentions transport to the destination (train, car)\n"
-                    f"- Includes local snacks, rest breaks\n"
-                    f"- Ends with visiting the 2nd monument and settling down\n\n"
-                    f"Format JSON like this:\n"
-                    f"{{\n"
-                    f"  \"day\": {day_number},\n"
-                    f"  \"city\": \"{city_from} to {city_to}\",\n"
-                    f"  \"plan\": \"<bullet-point format itinerary>\"\n"
-                    f"}}"
-                )
+        all_day_itineraries = await asyncio.gather(*tasks)
+        return JSONResponse(content={"itinerary": all_day_itineraries})
 
-            else:
-                raise HTTPException(status_code=400, detail=f"Invalid day type '{day_type}' for day {day_number}")
+    except Exception as e:
+        for task in tasks:
+            task.cancel()
+        raise HTTPException(status_code=500, detail=f"Gemini itinerary error: {str(e)}")
 
-            model = genai.GenerativeModel("gemini-2.5-pro")  # type: ignore
-            response = model.generate_content(prompt)
-            content = response.text.strip()
 
-            try:
-                itinerary_entry = json.loads(content)
-            except json.JSONDecodeError:
-                match = re.search(r"\{.*\}", content, re.DOTALL)
-                if match:
-                    itinerary_entry = json.loads(match.group())
-                else:
-                    raise HTTPException(status_code=500, detail=f"Invalid JSON for day {day_number}.")
+@router.post("/api/generate-itinerary/stream")
+async def generate_itinerary_stream(data: ItineraryRequest):
+    """NDJSON: one line per day, in day order, each sent as soon as that day and the ones before it are done."""
+    if not data.cities or not data.days:
+        raise HTTPException(status_code=400, detail="Cities and day-wise data are required.")
 
-            all_day_itineraries.append(itinerary_entry)
+    tasks = start_day_tasks(data.days)
 
-        return JSONResponse(content={"itinerary": all_day_itineraries})
+    async def lines():
+        try:
+            for day_number, task in enumerate(tasks, start=1):
+                try:
+                    entry = await task
+                    line = {"day": day_number, "itinerary": entry}
+                except Exception as e:
+                    detail = e.detail if isinstance(e, HTTPException) else str(e)
+                    line = {"day": day_number, "error": f"Gemini itinerary error: {detail}"}
+                yield json.dumps(line) + "\n"
+        finally:
+            # Client went away or we finished: don't leave Gemini calls running.
+            for task in tasks:
+                task.cancel()
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Gemini itinerary error: {str(e)}")
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 
@@ -462,70 +531,40 @@ class POI(BaseModel):
 class DayRouteInput(BaseModel):
     rawItinerary: List[Dict[str, Any]]
 
-def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    R = 6371
-    φ1, φ2 = math.radians(lat1), math.radians(lat2)
-    Δφ = math.radians(lat2 - lat1)
-    Δλ = math.radians(lon2 - lon1)
-    a = math.sin(Δφ/2)**2 + math.cos(φ1)*math.cos(φ2)*math.sin(Δλ/2)**2
-    return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
 def compute_optimal_poi_path(pois: List[Dict[str, Any]]) -> List[int]:
+    """Visit order for a day's POIs; the first and last POI stay fixed."""
     n = len(pois)
     if n <= 1:
         return list(range(n))
-    best_order: Optional[List[int]] = None
-    min_dist = float("inf")
-    for perm in permutations(range(1, n - 1)):
-        path = [0] + list(perm) + [n - 1]
-        dist = 0.0
-        for i in range(len(path) - 1):
-            p, q = pois[path[i]], pois[path[i+1]]
-            dist += haversine(p["lat"], p["lng"], q["lat"], q["lng"])
-        if dist < min_dist:
-            min_dist = dist
-            best_order = path
-    return best_order or list(range(n))
+    with stage("route_solve"):
+        return solve_path(pairwise_km(coords_of(pois)))
 
 @router.post("/api/generate-day-route")
-def generate_day_route(payload: DayRouteInput):
+async def generate_day_route(payload: DayRouteInput):
     output_routes = []
+    routed = []
 
     for entry in payload.rawItinerary:
-        day_num = entry.get("day")
         pois = entry.get("monuments", [])
 
         route_entry = {
-            "day": day_num,
+            "day": entry.get("day"),
             "places": pois,
             "polyline": None
         }
 
         if len(pois) >= 2:
             order = compute_optimal_poi_path(pois)
-            ordered = [pois[i] for i in order]
-
-            origin      = f"{ordered[0]['lat']},{ordered[0]['lng']}"
-            destination = f"{ordered[-1]['lat']},{ordered[-1]['lng']}"
-            mids = ordered[1:-1]
-            waypoints = "|".join(f"{m['lat']},{m['lng']}" for m in mids)
-
-            params = {
-                "origin": origin,
-                "destination": destination,
-                "key": GOOGLE_MAPS_ROUTE_KEY,
-                **({"waypoints": waypoints} if waypoints else {})
-            }
-            resp = requests.get(
-                "https://maps.googleapis.com/maps/api/directions/json",
-                params=params
-            ).json()
-
-            routes = resp.get("routes", [])
-            if routes:
-                route_entry["polyline"] = routes[0]["overview_polyline"]["points"]
-                route_entry["places"]   = ordered
+            routed.append((route_entry, [pois[i] for i in order]))
 
         output_routes.append(route_entry)
 
+    # One Directions round trip for the whole trip; unchanged days come from the cache.
+    routes = await fetch_routes([ordered for _, ordered in routed], GOOGLE_MAPS_ROUTE_KEY)
+    for (route_entry, ordered), route in zip(routed, routes):
+        if route and route["polyline"]:
+            route_entry["polyline"] = route["polyline"]
+            route_entry["legs"] = route["legs"]
+            route_entry["places"] = ordered
+
     return {"routes": output_routes}
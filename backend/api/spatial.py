@@ -0,0 +1,117 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from api.geo import EARTH_RADIUS_KM, haversine_matrix
+from config.settings import SPATIAL_MAX_PLACES
+
+# Inserts wait in a brute-force buffer until there are this many, then the tree is rebuilt.
+REBUILD_AT = 256
+# Past the cap this fraction of the oldest places goes in one go, so eviction isn't a rebuild per insert.
+EVICT_FRACTION = 0.1
+
+
+def place_key(place: Dict[str, Any]) -> Tuple[str, float, float]:
+    # Live entries carry no place_id, so the same place is recognised by name and position.
+    return place.get("name", ""), round(place["lat"], 5), round(place["lng"], 5)
+
+
+class SpatialIndex:
+    """Haversine BallTree over place entries, plus an unindexed buffer of recent inserts.
+
+    Holds at most `max_places`; the oldest inserts are dropped first, which also ages out
+    places that have since moved or been renamed.
+    """
+
+    def __init__(self, rebuild_at: int = REBUILD_AT, max_places: int = SPATIAL_MAX_PLACES):
+        self.rebuild_at = rebuild_at
+        self.max_places = max_places
+        self.places: List[Dict[str, Any]] = []  # tree rows first, then the buffer
+        self.coords = np.empty((0, 2))  # [lat, lng] in degrees, same order as places
+        self.keys = set()
+        self.tree = None
+        self.indexed = 0
+        self.rebuilds = 0
+        self.evicted = 0
+
+    def insert(self, places: List[Dict[str, Any]]) -> int:
+        """Add place entries not seen before; returns how many were new."""
+        added = []
+        for place in places:
+            if place.get("lat") is None or place.get("lng") is None:
+                continue
+            key = place_key(place)
+            if key in self.keys:
+                continue
+            self.keys.add(key)
+            # Response ids are per request, so they mean nothing here.
+            self.places.append({k: v for k, v in place.items() if k != "id"})
+            added.append([place["lat"], place["lng"]])
+        if added:
+            self.coords = np.vstack([self.coords, np.array(added, dtype=np.float64)])
+        if len(self.places) > self.max_places:
+            self.evict(len(self.places) - self.max_places + int(self.max_places * EVICT_FRACTION))
+        elif len(self.places) - self.indexed >= self.rebuild_at:
+            self.rebuild()
+        return len(added)
+
+    def evict(self, count: int):
+        """Drop the `count` oldest places and rebuild over the rest."""
+        for place in self.places[:count]:
+            self.keys.discard(place_key(place))
+        self.places = self.places[count:]
+        self.coords = self.coords[count:]
+        self.evicted += count
+        self.tree = None
+        self.indexed = 0
+        self.rebuild()
+
+    def rebuild(self):
+        from sklearn.neighbors import BallTree
+
+        if self.places:
+            self.tree = BallTree(np.radians(self.coords), metric="haversine")
+            self.indexed = len(self.places)
+            self.rebuilds += 1
+
+    def _search(self, lat: float, lng: float, k: int, radius_km: Optional[float]) -> List[Tuple[float, int]]:
+        found: List[Tuple[float, int]] = []
+        if self.tree is not None:
+            point = np.radians([[lat, lng]])
+            if radius_km is None:
+                dist, ind = self.tree.query(point, k=min(k, self.indexed))
+            else:
+                ind, dist = self.tree.query_radius(
+                    point, r=radius_km / EARTH_RADIUS_KM, return_distance=True, sort_results=True
+                )
+            found.extend(zip((dist[0] * EARTH_RADIUS_KM).tolist(), ind[0].tolist()))
+
+        if len(self.places) > self.indexed:
+            buffered = haversine_matrix(np.array([[lat, lng]]), self.coords[self.indexed:])[0]
+            found.extend(
+                (d, self.indexed + offset)
+                for offset, d in enumerate(buffered.tolist())
+                if radius_km is None or d <= radius_km
+            )
+
+        found.sort()
+        return found[:k]
+
+    def nearest(self, lat: float, lng: float, k: int = 10, radius_km: Optional[float] = None) -> List[Dict[str, Any]]:
+        """The `k` places closest to (lat, lng), nearest first, optionally only those within `radius_km`."""
+        return [
+            {**self.places[i], "distance_km": round(d, 3)}
+            for d, i in self._search(lat, lng, k, radius_km)
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "places": len(self.places),
+            "indexed": self.indexed,
+            "rebuilds": self.rebuilds,
+            "evicted": self.evicted,
+            "max_places": self.max_places,
+        }
+
+
+spatial_indexes = {"monuments": SpatialIndex(), "full_day": SpatialIndex()}
@@ -0,0 +1,177 @@
+"""Static files for the built frontend: cache headers, precompressed sidecars and an in-memory index.html.
+
+Sidecars (`<file>.br`, `<file>.gz`) can be written at build time with
+
+    python -m api.static_assets ../dist
+
+Setting STATIC_PRECOMPRESS=true also has the server fill in whatever is missing or stale
+in the background at startup; every worker does that, so prefer the build step.
+"""
+import gzip
+import mimetypes
+import os
+import stat
+import sys
+from typing import Dict, List, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from api.byte_ranges import bytes_response, content_etag
+
+try:
+    import brotli
+except ImportError:  # optional: gzip sidecars only
+    brotli = None
+
+# Already compressed; another pass only costs CPU.
+INCOMPRESSIBLE = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".avif", ".mp3", ".mp4", ".webm", ".woff", ".woff2", ".zip"}
+SIDECARS = {"br": ".br", "gzip": ".gz"}
+# A sidecar that saves less than this fraction is not worth the Vary split.
+MIN_SAVING = 0.1
+
+REVALIDATE = "no-cache"
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=11)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _is_source(name: str) -> bool:
+    _, ext = os.path.splitext(name)
+    return ext.lower() not in INCOMPRESSIBLE and ext not in SIDECARS.values()
+
+
+def precompress(directory: str) -> int:
+    """Write missing or stale .br/.gz sidecars next to the compressible files in `directory`."""
+    encodings = [e for e in SIDECARS if e != "br" or brotli is not None]
+    written = 0
+    for root, _, names in os.walk(directory):
+        for name in names:
+            if not _is_source(name):
+                continue
+            path = os.path.join(root, name)
+            mtime = os.stat(path).st_mtime
+            data = None
+            for encoding in encodings:
+                sidecar = path + SIDECARS[encoding]
+                if os.path.exists(sidecar) and os.stat(sidecar).st_mtime >= mtime:
+                    continue
+                if data is None:
+                    with open(path, "rb") as f:
+                        data = f.read()
+                compressed = _compress(data, encoding)
+                if len(compressed) > len(data) * (1 - MIN_SAVING):
+                    continue
+                # Per-process temp name: concurrent writers never share (or truncate) a half-written file.
+                tmp = f"{sidecar}.{os.getpid()}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(compressed)
+                os.replace(tmp, sidecar)
+                written += 1
+    return written
+
+
+def _accepted(header: str) -> Dict[str, float]:
+    accepted = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    return accepted
+
+
+class AssetFiles(StaticFiles):
+    """StaticFiles with a Cache-Control policy and precompressed variants when the client accepts them.
+
+    ETag/304 and Range come from Starlette's FileResponse; a sidecar gets its own ETag
+    from its own stat, and Range requests are always served from the uncompressed file.
+    """
+
+    def __init__(self, directory: str, cache_control: str = REVALIDATE, **kwargs):
+        super().__init__(directory=directory, **kwargs)
+        self.cache_control = cache_control
+
+    def _sidecar(self, full_path: str, request_headers: Headers):
+        if "range" in request_headers or not _is_source(full_path):
+            return None
+        accepted = _accepted(request_headers.get("accept-encoding", ""))
+        for encoding, suffix in SIDECARS.items():
+            if accepted.get(encoding, 0) <= 0:
+                continue
+            sidecar = full_path + suffix
+            try:
+                sidecar_stat = os.stat(sidecar)
+            except OSError:
+                continue
+            if stat.S_ISREG(sidecar_stat.st_mode) and sidecar_stat.st_mtime >= os.stat(full_path).st_mtime:
+                return encoding, sidecar, sidecar_stat
+        return None
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        full_path = str(full_path)
+        variant = self._sidecar(full_path, request_headers)
+        if variant is None:
+            response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        else:
+            encoding, sidecar, sidecar_stat = variant
+            media_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+            response = FileResponse(sidecar, status_code=status_code, stat_result=sidecar_stat, media_type=media_type)
+            response.headers["Content-Encoding"] = encoding
+        if _is_source(full_path):
+            response.headers["Vary"] = "Accept-Encoding"
+        response.headers["Cache-Control"] = self.cache_control
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+class IndexPage:
+    """index.html held in memory; re-read only when the file on disk changes."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.mtime: Optional[float] = None
+        self.data = b""
+        self.etag = ""
+
+    def load(self):
+        mtime = os.stat(self.path).st_mtime
+        if mtime != self.mtime:
+            with open(self.path, "rb") as f:
+                self.data = f.read()
+            self.etag = content_etag(self.data)
+            self.mtime = mtime
+
+    def response(self, request: Request) -> Response:
+        self.load()
+        # Revalidated on every load so a new deploy's hashed bundle names are picked up at once.
+        return bytes_response(request, self.data, "text/html; charset=utf-8", etag=self.etag, cache_control=REVALIDATE)
+
+
+def precompress_all(directories: List[str]):
+    for directory in directories:
+        try:
+            written = precompress(directory)
+            if written:
+                print(f"Precompressed {written} static file variants in {directory}")
+        except OSError as e:
+            print(f"Precompressing {directory} failed: {e}")
+
+
+if __name__ == "__main__":
+    dist = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), "..", "..", "dist")
+    precompress_all([os.path.join(dist, sub) for sub in ("assets", "models", "animations")])
@@ -0,0 +1,77 @@
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from bson.binary import Binary
+
+from api.byte_cache import ByteLRUCache
+from api.llm_cache import normalize_prompt
+from api.mongo import get_collection
+from config.settings import TTS_CACHE_BYTES, TTS_CACHE_PERSIST, TTS_CACHE_TTL_SECONDS
+
+
+def tts_key(text: str, voice_id: str, model_id: str, output_format: str, voice_settings: Dict[str, Any]) -> str:
+    """Everything that changes the synthesized audio; whitespace in the text does not."""
+    payload = "\0".join([
+        normalize_prompt(text),
+        voice_id or "",
+        model_id,
+        output_format,
+        json.dumps(voice_settings, sort_keys=True),
+    ])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """Synthesized audio: byte-budgeted LRU in memory, Mongo (next to audio_clips) behind it."""
+
+    def __init__(self, max_bytes: int = TTS_CACHE_BYTES, ttl: int = TTS_CACHE_TTL_SECONDS):
+        self.memory = ByteLRUCache(max_bytes)
+        self.collection = get_collection("tts_cache") if TTS_CACHE_PERSIST else None
+        self.ttl = ttl
+        self.persistent_hits = 0
+        self._indexed = False
+
+    async def get(self, key: str) -> Optional[bytes]:
+        audio = self.memory.get(key)
+        if audio is not None or self.collection is None:
+            return audio
+
+        try:
+            doc = await self.collection.find_one({"_id": key}, projection={"audio": 1, "expires_at": 1})
+        except Exception:
+            return None  # a cache outage costs quota, not the answer
+        if doc and doc["expires_at"].replace(tzinfo=timezone.utc) > datetime.now(timezone.utc):
+            audio = bytes(doc["audio"])
+            self.persistent_hits += 1
+            self.memory.set(key, audio)
+            return audio
+        return None
+
+    async def set(self, key: str, audio: bytes, text: str = ""):
+        self.memory.set(key, audio)
+        if self.collection is None:
+            return
+
+        try:
+            if not self._indexed:
+                await self.collection.create_index("expires_at", expireAfterSeconds=0)
+                self._indexed = True
+            expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl)
+            await self.collection.replace_one(
+                {"_id": key},
+                {"_id": key, "audio": Binary(audio), "text": text, "expires_at": expires_at},
+                upsert=True,
+            )
+        except Exception:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.memory.stats()
+        stats["persistent_hits"] = self.persistent_hits
+        stats["persistent"] = self.collection is not None
+        return stats
+
+
+tts_cache = TTSCache()
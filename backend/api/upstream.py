@@ -0,0 +1,218 @@
+import asyncio
+import random
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from api.metrics import upstream_requests, upstream_seconds
+from config.settings import (
+    GOOGLE_MAPS_BASE_URL,
+    GOOGLE_MAPS_CONCURRENCY,
+    UPSTREAM_BREAKER_FAILURES,
+    UPSTREAM_BREAKER_RESET_SECONDS,
+    UPSTREAM_RETRIES,
+)
+
+RETRY_BASE_SECONDS = 0.2
+RETRY_MAX_SECONDS = 2.0
+
+# Google reports throttling and transient failures in the body with HTTP 200.
+RETRYABLE_API_STATUSES = {"OVER_QUERY_LIMIT", "UNKNOWN_ERROR"}
+
+
+class UpstreamError(RuntimeError):
+    pass
+
+
+class CircuitOpen(UpstreamError):
+    pass
+
+
+class CircuitBreaker:
+    """Opens after `failures` consecutive failed calls; lets one probe through after `reset_after` seconds."""
+
+    def __init__(self, failures: int = UPSTREAM_BREAKER_FAILURES, reset_after: float = UPSTREAM_BREAKER_RESET_SECONDS):
+        self.failures = failures
+        self.reset_after = reset_after
+        self.consecutive = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if time.monotonic() - self.opened_at >= self.reset_after else "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self.probing:
+            self.probing = True
+            return True
+        return False
+
+    def record_success(self):
+        self.consecutive = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self):
+        self.consecutive += 1
+        if self.probing or self.consecutive >= self.failures:
+            self.opened_at = time.monotonic()
+        self.probing = False
+
+    def release(self):
+        """The call ended without telling us anything (e.g. cancelled); let the next one probe."""
+        self.probing = False
+
+
+class Endpoint:
+    def __init__(self, path: str, timeout: float):
+        self.path = path
+        self.timeout = timeout
+        self.breaker = CircuitBreaker()
+
+    def bind(self, upstream: str, name: str):
+        self.labels = (upstream, name)
+        self.latency = upstream_seconds.labels(upstream, name)
+
+    def count(self, outcome: str):
+        upstream_requests.inc(*self.labels, outcome)
+
+    def outcomes(self) -> Dict[str, int]:
+        return {
+            values[2]: child.value
+            for values, child in upstream_requests.children.items()
+            if values[:2] == self.labels
+        }
+
+
+class UpstreamClient:
+    """Pooled keep-alive client for one upstream host.
+
+    Every call gets the endpoint's timeout, a shared concurrency limit for
+    the host, jittered retries on 429/5xx/transport errors, and a circuit
+    breaker per endpoint so a failing API is skipped instead of waited on.
+    """
+
+    def __init__(self, name: str, base_url: str, endpoints: Dict[str, Endpoint], concurrency: int, retries: int = UPSTREAM_RETRIES):
+        self.name = name
+        self.base_url = base_url
+        self.endpoints = endpoints
+        for endpoint_name, endpoint in endpoints.items():
+            endpoint.bind(name, endpoint_name)
+        self.concurrency = concurrency
+        self.retries = retries
+        self._client: Optional[httpx.AsyncClient] = None
+        self._limit: Optional[asyncio.Semaphore] = None
+
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(10.0),
+                limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+            )
+            self._limit = asyncio.Semaphore(self.concurrency)
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+        self._client = None
+        self._limit = None
+
+    async def _attempt(self, endpoint: Endpoint, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Parsed body, or None when the attempt failed in a way worth retrying."""
+        client = self.client()
+        async with self._limit:
+            start = time.perf_counter()
+            try:
+                resp = await client.get(endpoint.path, params=params, timeout=endpoint.timeout)
+            except httpx.HTTPError as e:
+                endpoint.count(type(e).__name__)
+                return None
+            finally:
+                endpoint.latency.observe(time.perf_counter() - start)
+
+        endpoint.count(str(resp.status_code))
+        if resp.status_code == 429 or resp.status_code >= 500:
+            return None
+        if resp.status_code >= 400:
+            raise UpstreamError(f"{self.name} {endpoint.path} returned {resp.status_code}")
+
+        try:
+            data = resp.json()
+        except ValueError:
+            data = None
+        if not isinstance(data, dict):
+            endpoint.count("bad_body")
+            return None
+        if data.get("status") in RETRYABLE_API_STATUSES:
+            endpoint.count(data["status"])
+            return None
+        return data
+
+    async def get_json(self, endpoint_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        endpoint = self.endpoints[endpoint_name]
+        if not endpoint.breaker.allow():
+            endpoint.count("circuit_open")
+            raise CircuitOpen(f"{self.name} {endpoint.path} is failing; circuit open")
+
+        # Every way out of here must settle the breaker, or a half-open probe would never end.
+        try:
+            for attempt in range(self.retries + 1):
+                if attempt:
+                    endpoint.count("retry")
+                    # Full jitter, so throttled callers don't come back in lockstep.
+                    await asyncio.sleep(random.uniform(0, min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** attempt)))
+                try:
+                    data = await self._attempt(endpoint, params)
+                except UpstreamError:
+                    # A 4xx is our request's fault, not the upstream's health.
+                    endpoint.breaker.record_success()
+                    raise
+                if data is not None:
+                    endpoint.breaker.record_success()
+                    return data
+        except asyncio.CancelledError:
+            endpoint.breaker.release()
+            raise
+        except UpstreamError:
+            raise
+        except Exception:
+            endpoint.breaker.record_failure()
+            raise
+
+        endpoint.breaker.record_failure()
+        raise UpstreamError(f"{self.name} {endpoint.path} failed after {self.retries + 1} attempts")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            name: {
+                "circuit": endpoint.breaker.state,
+                "outcomes": endpoint.outcomes(),
+                "latency_seconds": endpoint.latency.snapshot(),
+            }
+            for name, endpoint in self.endpoints.items()
+        }
+
+
+google_maps = UpstreamClient(
+    "google_maps",
+    GOOGLE_MAPS_BASE_URL,
+    {
+        "textsearch": Endpoint("/place/textsearch/json", timeout=8.0),
+        "details": Endpoint("/place/details/json", timeout=6.0),
+        "directions": Endpoint("/directions/json", timeout=10.0),
+    },
+    concurrency=GOOGLE_MAPS_CONCURRENCY,
+)
+
+
+async def close_clients():
+    await google_maps.close()
@@ -0,0 +1,122 @@
+import asyncio
+import re
+import threading
+from typing import AsyncIterator, Callable, Iterable, List, Optional
+
+_SENTENCE_END = re.compile(r"(?<=[.!?।])\s+")
+
+
+async def split_sentences(tokens: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Re-chunk a token stream into sentences as soon as each one is complete."""
+    buffer = ""
+    async for token in tokens:
+        buffer += token
+        parts = _SENTENCE_END.split(buffer)
+        for sentence in parts[:-1]:
+            if sentence.strip():
+                yield sentence.strip()
+        buffer = parts[-1]
+    if buffer.strip():
+        yield buffer.strip()
+
+
+async def iterate_in_thread(make_iterable: Callable[[], Iterable[bytes]]) -> AsyncIterator[bytes]:
+    """Consume a blocking iterator on a worker thread, handing items back to the event loop as they arrive."""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+    cancelled = threading.Event()
+
+    def run():
+        try:
+            for item in make_iterable():
+                if cancelled.is_set():
+                    break
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+        except BaseException as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, done)
+
+    loop.run_in_executor(None, run)
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        # Let the thread stop at its next item; don't block the loop waiting for it.
+        cancelled.set()
+
+
+async def gemini_tokens(model, contents) -> AsyncIterator[str]:
+    response = await model.generate_content_async(contents, stream=True)
+    async for chunk in response:
+        text = getattr(chunk, "text", "")
+        if text:
+            yield text
+
+
+async def text_tokens(text: str) -> AsyncIterator[str]:
+    yield text
+
+
+async def stream_speech(
+    sentences: AsyncIterator[str],
+    synthesize: Callable[[str], AsyncIterator[bytes]],
+    lookahead: int = 3,
+) -> AsyncIterator[bytes]:
+    """Audio for each sentence, in order, while later sentences are still being written and synthesized.
+
+    At most `lookahead` sentences are in progress at once, counting the one currently being sent.
+    """
+    pending: asyncio.Queue = asyncio.Queue()
+    # Taken before a synthesis starts, given back once that sentence has been fully sent.
+    slots = asyncio.Semaphore(lookahead)
+    workers: List[asyncio.Task] = []
+    end = object()
+
+    async def synthesize_into(sentence: str, out: asyncio.Queue):
+        try:
+            async for chunk in synthesize(sentence):
+                await out.put(chunk)
+        except Exception as e:
+            await out.put(e)
+        finally:
+            await out.put(end)
+
+    async def produce():
+        try:
+            async for sentence in sentences:
+                await slots.acquire()
+                out: asyncio.Queue = asyncio.Queue()
+                workers.append(asyncio.create_task(synthesize_into(sentence, out)))
+                pending.put_nowait(out)
+        except Exception as e:
+            await pending.put(e)
+        finally:
+            await pending.put(end)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            out: Optional[asyncio.Queue] = await pending.get()
+            if out is end:
+                break
+            if isinstance(out, Exception):
+                raise out
+            while True:
+                chunk = await out.get()
+                if chunk is end:
+                    break
+                if isinstance(chunk, Exception):
+                    raise chunk
+                yield chunk
+            slots.release()
+    finally:
+        producer.cancel()
+        for worker in workers:
+            worker.cancel()
@@ -0,0 +1,82 @@
+"""/api/generate-day-route: serial Directions calls vs concurrent fan-out vs cache.
+
+    cd backend && python -m benchmarks.bench_day_route [--latency-ms 150 --days 10]
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+
+from benchmarks.bench_places import PORT, start_stub
+
+
+def make_trip(days: int, stops: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [
+        {
+            "day": day,
+            "monuments": [
+                {"name": f"Stop {day}-{i}", "lat": 26.9 + rng.random() / 10, "lng": 75.8 + rng.random() / 10}
+                for i in range(stops)
+            ],
+        }
+        for day in range(1, days + 1)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency-ms", type=float, default=150)
+    parser.add_argument("--days", type=int, default=10)
+    parser.add_argument("--stops", type=int, default=6)
+    args = parser.parse_args()
+
+    os.environ["GOOGLE_MAPS_BASE_URL"] = f"http://127.0.0.1:{PORT}"
+    server = start_stub(args.latency_ms)
+
+    import requests
+    from api import routes
+    from api.directions import directions_cache
+    from api.upstream import close_clients
+
+    trip = make_trip(args.days, args.stops)
+    payload = routes.DayRouteInput(rawItinerary=trip)
+
+    def serial():
+        for entry in trip:
+            pois = entry["monuments"]
+            ordered = [pois[i] for i in routes.compute_optimal_poi_path(pois)]
+            requests.get(
+                f"http://127.0.0.1:{PORT}/directions/json",
+                params={
+                    "origin": f"{ordered[0]['lat']},{ordered[0]['lng']}",
+                    "destination": f"{ordered[-1]['lat']},{ordered[-1]['lng']}",
+                    "waypoints": "|".join(f"{m['lat']},{m['lng']}" for m in ordered[1:-1]),
+                },
+            ).json()
+
+    async def run(edit_day=None):
+        if edit_day is not None:
+            trip[edit_day]["monuments"][1]["lat"] += 0.01
+        start = time.perf_counter()
+        result = await routes.generate_day_route(payload)
+        elapsed = time.perf_counter() - start
+        await close_clients()
+        assert all(r["polyline"] for r in result["routes"])
+        return elapsed
+
+    start = time.perf_counter()
+    serial()
+    print(f"stub latency {args.latency_ms:.0f} ms, {args.days} days x {args.stops} stops")
+    print(f"{'serial':<24}{time.perf_counter() - start:>8.3f}s")
+    directions_cache.clear()
+    print(f"{'concurrent, cold':<24}{asyncio.run(run()):>8.3f}s")
+    print(f"{'one day edited':<24}{asyncio.run(run(edit_day=3)):>8.3f}s")
+    print(f"{'unchanged':<24}{asyncio.run(run()):>8.4f}s")
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Q&A frame preparation: temp file + verify + full decode vs in-memory draft decode.
+
+Frames are synthetic 2:1 equirectangular images at common 360° video sizes.
+
+    cd backend && python -m benchmarks.bench_frames [--repeat 5]
+"""
+import argparse
+import io
+import os
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+from api.frames import FrameTooLarge, prepare_frame
+from config.settings import QA_IMAGE_MAX_EDGE
+
+SIZES = [(3840, 1920), (5760, 2880), (7680, 3840)]
+
+
+def make_frame(width: int, height: int, fmt: str) -> bytes:
+    """Smooth gradients plus noise, so the encoders do roughly as much work as on real footage."""
+    rng = np.random.default_rng(width)
+    y, x = np.mgrid[0:height, 0:width]
+    base = np.stack([x * 255 // width, y * 255 // height, (x + y) * 127 // (width + height)], axis=-1)
+    noise = rng.integers(0, 12, size=(height, width, 3))
+    pixels = np.clip(base + noise, 0, 255).astype(np.uint8)
+    out = io.BytesIO()
+    Image.fromarray(pixels).save(out, format=fmt, **({"quality": 90} if fmt == "JPEG" else {}))
+    return out.getvalue()
+
+
+def original(image_bytes: bytes) -> int:
+    """The old path: temp file, verify(), reopen and full-resolution decode; the SDK then sends lossless WebP."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmp:
+        tmp.write(image_bytes)
+        tmp_path = tmp.name
+    try:
+        with Image.open(tmp_path) as img:
+            img.verify()
+            img = Image.open(tmp_path).convert("RGB")
+        out = io.BytesIO()
+        img.save(out, format="webp", lossless=True)
+        return len(out.getvalue())
+    finally:
+        os.remove(tmp_path)
+
+
+def in_memory(image_bytes: bytes) -> int:
+    _, jpeg = prepare_frame(image_bytes)
+    return len(jpeg)
+
+
+def timed(fn, data: bytes, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = fn(data)
+        best = min(best, time.perf_counter() - start)
+    return best, size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-original", action="store_true", help="lossless WebP of 8K frames is slow")
+    args = parser.parse_args()
+
+    print(f"max edge {QA_IMAGE_MAX_EDGE}px")
+    print(f"{'frame':<16}{'upload':>10}{'original':>12}{'sent':>10}{'in-memory':>12}{'sent':>10}")
+    for fmt in ["JPEG", "PNG"]:
+        for width, height in SIZES:
+            data = make_frame(width, height, fmt)
+            label = f"{fmt} {width}x{height}"
+            try:
+                prepare_frame(data)
+            except FrameTooLarge as e:
+                print(f"{label:<16}{len(data) // 1024:>9}K  rejected: {e}")
+                continue
+            if args.skip_original:
+                orig = "-", "-"
+            else:
+                t, size = timed(original, data, 1)
+                orig = f"{t * 1000:.0f}ms", f"{size // 1024}K"
+            t, size = timed(in_memory, data, args.repeat)
+            print(f"{label:<16}{len(data) // 1024:>9}K{orig[0]:>12}{orig[1]:>10}{t * 1000:>10.0f}ms{size // 1024:>9}K")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Micro-benchmarks for the CPU-bound endpoints, with a saved baseline to catch regressions.
+
+    cd backend && python -m benchmarks.bench_hot_paths --save baseline.json
+    cd backend && python -m benchmarks.bench_hot_paths --compare baseline.json [--tolerance 0.25]
+
+--compare exits 1 when any case's best time is slower than the baseline's by
+more than the tolerance. The best of N runs is far less noisy than the median
+on a shared machine.
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+
+from api.routes import (
+    KMeansClusteringRequest,
+    Monument,
+    cluster_monuments,
+    compute_optimal_poi_path,
+    compute_outliers,
+)
+from benchmarks.bench_outliers import make_payload
+
+
+def random_pois(n, rng):
+    return [{"name": f"P{i}", "lat": 26.8 + rng.random() * 0.3, "lng": 75.7 + rng.random() * 0.3} for i in range(n)]
+
+
+def cluster_request(n, mode, rng):
+    monuments = [
+        Monument(id=i, name=f"M{i}", city="Jaipur", lat=26.8 + rng.random() * 0.3, lng=75.7 + rng.random() * 0.3, type="monument")
+        for i in range(n)
+    ]
+    return KMeansClusteringRequest(monuments=monuments, max_per_cluster=4, mode=mode)
+
+
+def cases(rng):
+    for n in [5, 10, 14, 20, 40]:
+        pois = random_pois(n, rng)
+        yield f"poi_path n={n}", lambda pois=pois: compute_optimal_poi_path(pois)
+    for n in [50, 200, 500]:
+        payload = make_payload(n, 4, rng)
+        yield f"outliers 4x{n}", lambda payload=payload: asyncio.run(compute_outliers(payload))
+    for mode in ["kmeans", "balanced"]:
+        for n in [20, 100, 400]:
+            request = cluster_request(n, mode, rng)
+            yield f"cluster {mode} n={n}", lambda request=request: asyncio.run(cluster_monuments(request))
+
+
+def measure(fn, repeat):
+    fn()  # warm-up: imports, caches, thread pools
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {
+        "best": samples[0],
+        "median": statistics.median(samples),
+        "p95": samples[min(len(samples) - 1, int(0.95 * len(samples)))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON written by --save")
+    parser.add_argument("--tolerance", type=float, default=0.3)
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    results, regressions = {}, []
+    print(f"{'case':<26}{'best':>10}{'median':>10}{'p95':>10}{'baseline':>10}")
+    for name, fn in cases(random.Random(0)):
+        result = results[name] = measure(fn, args.repeat)
+        base = baseline.get(name, {}).get("best")
+        flag = ""
+        if base is not None and result["best"] > base * (1 + args.tolerance):
+            regressions.append(name)
+            flag = "  REGRESSION"
+        base_text = f"{base * 1000:.2f}" if base is not None else "-"
+        print(f"{name:<26}{result['best'] * 1000:>8.2f}ms{result['median'] * 1000:>8.2f}ms{result['p95'] * 1000:>8.2f}ms{base_text:>10}{flag}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if regressions:
+        print(f"{len(regressions)} case(s) slower than baseline by more than {args.tolerance:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
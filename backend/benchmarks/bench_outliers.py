@@ -0,0 +1,89 @@
+"""/api/compute-outliers: original per-pair implementation vs the vectorized one.
+
+    cd backend && python -m benchmarks.bench_outliers [--sizes 50 200 500 1000] [--cities 4]
+"""
+import argparse
+import asyncio
+import random
+import time
+
+import numpy as np
+from sklearn.cluster import DBSCAN
+
+from api.routes import OutlierRequest, compute_outliers
+
+
+def original_city(monuments_raw, count):
+    """compute_outliers' per-city body before the rewrite."""
+    coords = np.radians([[m["lat"], m["lng"]] for m in monuments_raw])
+    kms_per_radian = 6371.0088
+    db = DBSCAN(eps=2.0 / kms_per_radian, min_samples=2, algorithm='ball_tree', metric='haversine')
+    labels = db.fit_predict(coords)
+
+    outliers = [m for i, m in enumerate(monuments_raw) if labels[i] == -1][:count]
+
+    def avg_dist(mon):
+        return np.mean([
+            np.linalg.norm(np.array([mon["lat"], mon["lng"]]) - np.array([other["lat"], other["lng"]]))
+            for other in monuments_raw if mon != other
+        ])
+
+    if len(outliers) < count:
+        remaining = [m for m in monuments_raw if m not in outliers]
+        remaining.sort(key=avg_dist, reverse=True)
+        outliers += remaining[:count - len(outliers)]
+
+    return {"monuments": [m for m in monuments_raw if m not in outliers], "outliers": outliers}
+
+
+def make_payload(n, cities, rng):
+    names = [f"City{c}" for c in range(cities)]
+    selection = {}
+    next_id = 1
+    for c, name in enumerate(names):
+        lat0, lng0 = 20 + c, 75 + c
+        monuments = []
+        for _ in range(n):
+            # Dense: everything sits within ~1 km, so DBSCAN finds no noise and the
+            # farthest-from-the-rest fallback does all the work.
+            monuments.append({
+                "id": next_id, "name": f"M{next_id}", "city": name,
+                "lat": lat0 + rng.uniform(-0.005, 0.005), "lng": lng0 + rng.uniform(-0.005, 0.005),
+            })
+            next_id += 1
+        selection[name] = {"monuments": monuments}
+    return OutlierRequest(cityWiseSelection=selection, interCityMap=[3] * cities, orderedCities=names)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 500, 1000])
+    parser.add_argument("--cities", type=int, default=4)
+    parser.add_argument("--original-max", type=int, default=500, help="skip the original above this size")
+    args = parser.parse_args()
+    rng = random.Random(3)
+
+    print(f"{args.cities} cities per request")
+    print(f"{'per city':>8} {'original (s)':>13} {'vectorized (s)':>15} {'speedup':>8}")
+    for n in args.sizes:
+        payload = make_payload(n, args.cities, rng)
+
+        original = None
+        if n <= args.original_max:
+            start = time.perf_counter()
+            for city in payload.orderedCities:
+                original_city(payload.cityWiseSelection[city]["monuments"], 2)
+            original = time.perf_counter() - start
+
+        start = time.perf_counter()
+        asyncio.run(compute_outliers(payload))
+        vectorized = time.perf_counter() - start
+
+        if original is None:
+            print(f"{n:>8} {'-':>13} {vectorized:>15.4f} {'-':>8}")
+        else:
+            print(f"{n:>8} {original:>13.3f} {vectorized:>15.4f} {original / vectorized:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Serial vs concurrent Places fetching against the local stub server.
+
+    cd backend && python -m benchmarks.bench_places [--latency-ms 150]
+"""
+import argparse
+import asyncio
+import os
+import threading
+import time
+
+PORT = 8765
+
+
+def start_stub(latency_ms: float):
+    os.environ["STUB_LATENCY_MS"] = str(latency_ms)
+    import uvicorn
+    from benchmarks.stub_places import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=PORT, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency-ms", type=float, default=150)
+    parser.add_argument("--max-cities", type=int, default=5)
+    args = parser.parse_args()
+
+    base_url = f"http://127.0.0.1:{PORT}"
+    os.environ["GOOGLE_MAPS_BASE_URL"] = base_url
+    os.environ.setdefault("GOOGLE_API_KEY_MONUMENT", "stub-key")
+    server = start_stub(args.latency_ms)
+
+    import requests
+    from api import routes
+    from api.dedup import DedupContext
+    from api.place_cache import details_cache, search_cache
+    from api.places import DETAIL_FIELDS
+    from api.upstream import close_clients
+
+    def serial(cities):
+        seen = set()
+        for city in cities:
+            query = routes.MONUMENT_QUERY.format(city=city)
+            res = requests.get(f"{base_url}/place/textsearch/json", params={"query": query, "key": "k"}).json()
+            for place in res.get("results", [])[:10]:
+                if place["place_id"] in seen:
+                    continue
+                seen.add(place["place_id"])
+                if place.get("rating", 0.0) < 3.8 or place.get("user_ratings_total", 0) < 300:
+                    continue
+                requests.get(
+                    f"{base_url}/place/details/json",
+                    params={"place_id": place["place_id"], "fields": DETAIL_FIELDS, "key": "k"},
+                ).json()
+
+    async def run_concurrent(cities, warm=False):
+        if not warm:
+            details_cache.clear()
+            search_cache.clear()
+        start = time.perf_counter()
+        await routes.get_monuments(cities=cities, dedup=DedupContext())
+        elapsed = time.perf_counter() - start
+        await close_clients()
+        return elapsed
+
+    print(f"stub latency {args.latency_ms:.0f} ms per call")
+    print(f"{'cities':>6} {'serial (s)':>11} {'async (s)':>10} {'speedup':>8} {'cached (s)':>11}")
+    for n in range(1, args.max_cities + 1):
+        cities = [f"City{i}" for i in range(n)]
+
+        start = time.perf_counter()
+        serial(cities)
+        serial_time = time.perf_counter() - start
+
+        async_time = asyncio.run(run_concurrent(cities))
+        cached_time = asyncio.run(run_concurrent(cities, warm=True))
+        print(
+            f"{n:>6} {serial_time:>11.3f} {async_time:>10.3f} "
+            f"{serial_time / async_time:>7.1f}x {cached_time:>11.4f}"
+        )
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Route solver vs the original permutation brute force.
+
+    cd backend && python -m benchmarks.bench_route_solver [--brute-max 10] [--max-stops 40]
+
+For every size the brute force can handle, the exact solver must return the
+same optimal cost; the script exits non-zero if it does not.
+"""
+import argparse
+import math
+import random
+import sys
+import time
+from itertools import permutations
+
+from api.geo import coords_of, pairwise_km
+from api.route_solver import (
+    HELD_KARP_MAX_STOPS,
+    held_karp_path,
+    heuristic_path,
+    path_cost,
+    solve_path,
+)
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    R = 6371
+    φ1, φ2 = math.radians(lat1), math.radians(lat2)
+    Δφ = math.radians(lat2 - lat1)
+    Δλ = math.radians(lon2 - lon1)
+    a = math.sin(Δφ / 2) ** 2 + math.cos(φ1) * math.cos(φ2) * math.sin(Δλ / 2) ** 2
+    return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def brute_force(pois):
+    """The original compute_optimal_poi_path."""
+    n = len(pois)
+    if n <= 1:
+        return list(range(n))
+    best_order, min_dist = None, float("inf")
+    for perm in permutations(range(1, n - 1)):
+        path = [0] + list(perm) + [n - 1]
+        dist = 0.0
+        for i in range(len(path) - 1):
+            p, q = pois[path[i]], pois[path[i + 1]]
+            dist += haversine(p["lat"], p["lng"], q["lat"], q["lng"])
+        if dist < min_dist:
+            min_dist, best_order = dist, path
+    return best_order or list(range(n))
+
+
+def random_pois(n, rng):
+    # Spread over roughly a city-sized box around Jaipur.
+    return [{"lat": 26.9 + rng.uniform(-0.1, 0.1), "lng": 75.8 + rng.uniform(-0.1, 0.1)} for _ in range(n)]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--brute-max", type=int, default=10)
+    parser.add_argument("--max-stops", type=int, default=40)
+    parser.add_argument("--trials", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    print("correctness: exact solver vs brute force")
+    for n in range(2, min(args.brute_max, 9) + 1):
+        for _ in range(args.trials):
+            pois = random_pois(n, rng)
+            dist = pairwise_km(coords_of(pois), cache=False)
+            expected = path_cost(dist, brute_force(pois))
+            got = path_cost(dist, held_karp_path(dist))
+            if abs(expected - got) > 1e-6:
+                print(f"  n={n}: held-karp {got:.6f} km != brute force {expected:.6f} km")
+                sys.exit(1)
+        print(f"  n={n}: {args.trials} random days match")
+
+    print()
+    print(f"{'stops':>5} {'brute (s)':>10} {'solver (s)':>11} {'solver':>11} {'gap vs exact':>13}")
+    for n in range(4, args.max_stops + 1, 1 if args.max_stops <= 16 else 2):
+        pois = random_pois(n, rng)
+        dist = pairwise_km(coords_of(pois), cache=False)
+
+        brute_time = None
+        if n <= args.brute_max:
+            _, brute_time = timed(brute_force, pois)
+
+        path, solve_time = timed(lambda: solve_path(pairwise_km(coords_of(pois), cache=False)))
+        name = "held-karp" if n <= HELD_KARP_MAX_STOPS else "heuristic"
+
+        gap = ""
+        if n <= HELD_KARP_MAX_STOPS:
+            heuristic_cost = path_cost(dist, heuristic_path(dist))
+            gap = f"{100 * (heuristic_cost / path_cost(dist, path) - 1):.2f}% (heur.)"
+
+        brute = f"{brute_time:.4f}" if brute_time is not None else "-"
+        print(f"{n:>5} {brute:>10} {solve_time:>11.4f} {name:>11} {gap:>13}")
+
+
+if __name__ == "__main__":
+    main()
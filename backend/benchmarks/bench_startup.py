@@ -0,0 +1,68 @@
+"""Worker cold start: import time of `main`, and time from process spawn to the first answered requests.
+
+    cd backend && python -m benchmarks.bench_startup [--runs 3]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+PORT = 8767
+CLUSTER_PAYLOAD = {
+    "monuments": [
+        {"id": i, "name": f"M{i}", "city": "Jaipur", "type": "monument", "lat": 26.9 + i / 100, "lng": 75.8 + i / 90}
+        for i in range(8)
+    ],
+    "max_per_cluster": 4,
+}
+
+
+def import_time() -> float:
+    code = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def first_requests():
+    """Seconds from spawn to the first light request, and to the first request that needs scikit-learn."""
+    env = {**os.environ, "NARRATION_WARMUP": "false"}
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(PORT), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{PORT}") as client:
+            while True:
+                try:
+                    client.get("/api/places/cache-stats").raise_for_status()
+                    break
+                except httpx.TransportError:
+                    time.sleep(0.01)
+            light = time.perf_counter() - start
+            client.post("/api/cluster-monuments", json=CLUSTER_PAYLOAD, timeout=30).raise_for_status()
+            heavy = time.perf_counter() - start
+        return light, heavy
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    imports = [import_time() for _ in range(args.runs)]
+    requests = [first_requests() for _ in range(args.runs)]
+    print(f"import main              {statistics.median(imports):.2f}s")
+    print(f"first request            {statistics.median(r[0] for r in requests):.2f}s")
+    print(f"first clustering request {statistics.median(r[1] for r in requests):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Time to first audio for /virtual-tour/ask: answer-then-speak vs sentence streaming.
+
+Gemini and ElevenLabs are replaced by stubs with configurable latency.
+
+    cd backend && python -m benchmarks.bench_voice_stream [--ttft-ms 600 --token-ms 40 --tts-ms 400]
+"""
+import argparse
+import asyncio
+import time
+
+from api.voice_stream import iterate_in_thread, split_sentences, stream_speech
+
+ANSWER = (
+    "The Hawa Mahal was built in 1799 by Maharaja Sawai Pratap Singh. "
+    "Its 953 small windows let royal women watch street festivals unseen. "
+    "The honeycomb facade also keeps the palace cool in the summer heat. "
+    "It is made of red and pink sandstone, like much of Jaipur. "
+    "Most visitors only see the front, but the palace is just five storeys deep."
+)
+
+
+class StubBackends:
+    def __init__(self, ttft_ms: float, token_ms: float, tts_ms: float, chunk_ms: float, chunks: int):
+        self.ttft = ttft_ms / 1000
+        self.token = token_ms / 1000
+        self.tts = tts_ms / 1000
+        self.chunk = chunk_ms / 1000
+        self.chunks = chunks
+
+    async def llm_tokens(self):
+        await asyncio.sleep(self.ttft)
+        for word in ANSWER.split(" "):
+            yield word + " "
+            await asyncio.sleep(self.token)
+
+    async def llm_full(self) -> str:
+        return "".join([token async for token in self.llm_tokens()]).strip()
+
+    def tts_blocking(self, text: str):
+        """Blocking like the ElevenLabs SDK: a first-byte delay, then a few chunks."""
+        time.sleep(self.tts)
+        for _ in range(self.chunks):
+            time.sleep(self.chunk)
+            yield b"\x00" * 4096
+
+    def tts_async(self, text: str):
+        return iterate_in_thread(lambda: self.tts_blocking(text))
+
+
+async def sequential(stubs: StubBackends):
+    """The old flow: whole answer from the LLM, then the whole answer through TTS."""
+    start = time.perf_counter()
+    text = await stubs.llm_full()
+    audio = await asyncio.to_thread(lambda: b"".join(stubs.tts_blocking(text)))
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed, len(audio)
+
+
+async def streaming(stubs: StubBackends, lookahead: int):
+    start = time.perf_counter()
+    first = None
+    size = 0
+    async for chunk in stream_speech(split_sentences(stubs.llm_tokens()), stubs.tts_async, lookahead=lookahead):
+        if first is None:
+            first = time.perf_counter() - start
+        size += len(chunk)
+    return first, time.perf_counter() - start, size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ttft-ms", type=float, default=600, help="LLM time to first token")
+    parser.add_argument("--token-ms", type=float, default=40, help="LLM delay per token")
+    parser.add_argument("--tts-ms", type=float, default=400, help="TTS time to first byte per request")
+    parser.add_argument("--chunk-ms", type=float, default=30, help="TTS delay per audio chunk")
+    parser.add_argument("--chunks", type=int, default=8, help="audio chunks per TTS request")
+    parser.add_argument("--lookahead", type=int, default=2)
+    args = parser.parse_args()
+
+    stubs = StubBackends(args.ttft_ms, args.token_ms, args.tts_ms, args.chunk_ms, args.chunks)
+
+    print(f"{'flow':<12}{'first audio':>14}{'total':>10}{'bytes':>10}")
+    for name, run in [("sequential", sequential(stubs)), ("streaming", streaming(stubs, args.lookahead))]:
+        first, total, size = asyncio.run(run)
+        print(f"{name:<12}{first * 1000:>12.0f}ms{total * 1000:>8.0f}ms{size:>10}")
+
+
+if __name__ == "__main__":
+    main()
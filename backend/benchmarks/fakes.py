@@ -0,0 +1,223 @@
+"""Offline stand-ins for Gemini, ElevenLabs and the audio_clips collection.
+
+Each fake takes a latency and an error rate. `install()` swaps them into the
+api modules by replacing module attributes, so nothing in api/ needs to know
+about them. Google Maps is faked over HTTP by benchmarks/stub_places.py.
+"""
+import asyncio
+import json
+import random
+import re
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class FakeUpstreamError(RuntimeError):
+    pass
+
+
+class Fault:
+    """Latency in ms plus an error rate in [0, 1]."""
+
+    def __init__(self, latency_ms: float = 0.0, error_rate: float = 0.0, jitter: float = 0.2, seed: int = 0):
+        self.latency = latency_ms / 1000
+        self.error_rate = error_rate
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+
+    def delay(self) -> float:
+        return self.latency * (1 + self.rng.uniform(-self.jitter, self.jitter))
+
+    def maybe_fail(self, what: str):
+        if self.rng.random() < self.error_rate:
+            raise FakeUpstreamError(f"injected {what} failure")
+
+
+# ----------------------------------------------------------------------------- Gemini
+
+QA_ANSWER = (
+    "This part of the monument dates back several centuries. "
+    "The carvings you can see were done by hand by local artisans. "
+    "Look closely and you will notice the floral patterns repeat along the arches. "
+    "Visitors often miss the inscriptions near the base, so take a moment to find them."
+)
+
+
+def fake_reply(prompt: str) -> str:
+    """Plausible output for each of the prompts the backend sends."""
+    day = re.search(r"Day: (\d+)", prompt)
+    if "JSON array of city names" in prompt:
+        cities = re.search(r"list of cities: (.+)\.\n", prompt)
+        return json.dumps(cities.group(1).split(", ") if cities else [])
+    if day:
+        return json.dumps({"day": int(day.group(1)), "schedule": [{"time": "09:00", "activity": "Arrive"}]})
+    return QA_ANSWER
+
+
+class _Response:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _Stream:
+    def __init__(self, text: str, fault: Fault, token_ms: float):
+        self.words = text.split(" ")
+        self.fault = fault
+        self.token = token_ms / 1000
+
+    def __aiter__(self):
+        return self._chunks()
+
+    async def _chunks(self):
+        for word in self.words:
+            await asyncio.sleep(self.token)
+            yield _Response(word + " ")
+
+
+class FakeGenerativeModel:
+    """Drop-in for the handles from api.gemini.gemini_model: `latency` is time to the first token."""
+
+    fault = Fault(800)
+    token_ms = 30.0
+    calls = 0
+
+    def __init__(self, model_name: str, *args, **kwargs):
+        self.model_name = model_name
+
+    async def generate_content_async(self, contents, stream: bool = False, **kwargs):
+        prompt = contents if isinstance(contents, str) else next(c for c in contents if isinstance(c, str))
+        FakeGenerativeModel.calls += 1
+        await asyncio.sleep(self.fault.delay())
+        self.fault.maybe_fail("Gemini")
+        text = fake_reply(prompt)
+        if stream:
+            return _Stream(text, self.fault, self.token_ms)
+        await asyncio.sleep(self.token_ms / 1000 * len(text.split(" ")))
+        return _Response(text)
+
+
+# ----------------------------------------------------------------------------- ElevenLabs
+
+class FakeTTS:
+    """Replacement for monument_qa.tts_stream: blocking, like the SDK's iterator."""
+
+    def __init__(self, fault: Fault, chunk_ms: float = 20.0, bytes_per_char: int = 400, chunk_size: int = 16 * 1024):
+        self.fault = fault
+        self.chunk = chunk_ms / 1000
+        self.bytes_per_char = bytes_per_char
+        self.chunk_size = chunk_size
+        self.calls = 0
+
+    def __call__(self, text: str) -> Iterator[bytes]:
+        self.calls += 1
+        time.sleep(self.fault.delay())
+        self.fault.maybe_fail("TTS")
+        remaining = len(text) * self.bytes_per_char
+        while remaining > 0:
+            time.sleep(self.chunk)
+            size = min(self.chunk_size, remaining)
+            remaining -= size
+            yield b"\xff\xfb" + b"\x00" * (size - 2)
+
+
+# ----------------------------------------------------------------------------- Mongo
+
+def _matches(doc: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    for field, cond in query.items():
+        value = doc.get(field)
+        if isinstance(cond, dict):
+            for op, arg in cond.items():
+                if op == "$ne" and value == arg:
+                    return False
+                if op in ("$lt", "$lte", "$gt", "$gte") and value is None:
+                    return False
+                if op == "$lt" and not value < arg:
+                    return False
+                if op == "$lte" and not value <= arg:
+                    return False
+                if op == "$gt" and not value > arg:
+                    return False
+                if op == "$gte" and not value >= arg:
+                    return False
+        elif value != cond:
+            return False
+    return True
+
+
+def _project(doc: Dict[str, Any], projection: Optional[Dict[str, int]]) -> Dict[str, Any]:
+    if not projection:
+        return dict(doc)
+    return {k: v for k, v in doc.items() if k == "_id" or projection.get(k)}
+
+
+class _Cursor:
+    def __init__(self, docs: List[Dict[str, Any]], fault: Fault):
+        self.docs = docs
+        self.fault = fault
+
+    async def to_list(self, length=None):
+        await asyncio.sleep(self.fault.delay())
+        self.fault.maybe_fail("Mongo")
+        return self.docs if length is None else self.docs[:length]
+
+
+class FakeCollection:
+    """The slice of the motor collection API that api/narrate.py uses."""
+
+    def __init__(self, docs: List[Dict[str, Any]], fault: Fault):
+        self.docs = docs
+        self.fault = fault
+
+    async def create_index(self, *args, **kwargs):
+        return "fake_index"
+
+    def find(self, query: Dict[str, Any], projection: Optional[Dict[str, int]] = None):
+        return _Cursor([_project(d, projection) for d in self.docs if _matches(d, query)], self.fault)
+
+    async def find_one(self, query, projection=None, sort=None):
+        await asyncio.sleep(self.fault.delay())
+        self.fault.maybe_fail("Mongo")
+        docs = [d for d in self.docs if _matches(d, query)]
+        for field, direction in reversed(sort or []):
+            docs.sort(key=lambda d: d.get(field), reverse=direction < 0)
+        return _project(docs[0], projection) if docs else None
+
+
+def make_audio_clips(monuments: List[str], duration_s: int = 600, clip_s: int = 10, clip_bytes: int = 48 * 1024) -> List[Dict[str, Any]]:
+    docs = []
+    for monument in monuments:
+        for start in range(0, duration_s, clip_s):
+            docs.append({
+                "_id": f"{monument}-{start}",
+                "monument": monument,
+                "start_time": start,
+                "end_time": start + clip_s,
+                "audio": bytes([start % 256]) * clip_bytes,
+            })
+    return docs
+
+
+# ----------------------------------------------------------------------------- wiring
+
+def install(
+    gemini: Fault,
+    tts: Fault,
+    mongo: Fault,
+    monuments: List[str],
+    token_ms: float = 30.0,
+) -> Dict[str, Any]:
+    """Point the api modules at the fakes. Call before the app handles requests."""
+    from api import monument_qa, narrate, routes
+
+    FakeGenerativeModel.fault = gemini
+    FakeGenerativeModel.token_ms = token_ms
+    routes.gemini_model = monument_qa.gemini_model = lambda model_name, api_key: FakeGenerativeModel(model_name)
+
+    fake_tts = FakeTTS(tts)
+    monument_qa.tts_stream = fake_tts
+    monument_qa.GOOGLE_GEMINI_API_KEY = monument_qa.GOOGLE_GEMINI_API_KEY or "fake"
+
+    clips = FakeCollection(make_audio_clips(monuments), mongo)
+    narrate.get_collection = lambda name: clips if name == "audio_clips" else None
+
+    return {"gemini": FakeGenerativeModel, "tts": fake_tts, "audio_clips": clips}
@@ -0,0 +1,220 @@
+"""Offline load test: the whole app on uvicorn, every external service faked.
+
+Google Maps is the HTTP stub from stub_places.py; Gemini, ElevenLabs and the
+audio_clips collection are the in-process fakes from fakes.py. Virtual users
+hit a weighted mix of endpoints and the run ends with p50/p95/p99 per endpoint.
+
+    cd backend && python -m benchmarks.load [--users 20 --duration 30 --error-rate 0.02]
+"""
+import argparse
+import asyncio
+import io
+import os
+import random
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+import numpy as np
+
+from benchmarks.bench_places import PORT as STUB_PORT, start_stub
+
+APP_PORT = 8766
+MONUMENTS = ["hawa_mahal", "taj_mahal", "red_fort"]
+
+
+def configure_env(args):
+    """Settings are read at import time, so this has to run before `main` is imported."""
+    os.environ["GOOGLE_MAPS_BASE_URL"] = f"http://127.0.0.1:{STUB_PORT}"
+    os.environ["STUB_ERROR_RATE"] = str(args.error_rate)
+    for name in ["GOOGLE_API_KEY_MONUMENT", "GOOGLE_API_KEY_CITY", "GOOGLE_API_KEY_INDEX", "GOOGLE_GEMINI_API_KEY", "GOOGLE_ITENARY_API_KEY"]:
+        os.environ.setdefault(name, "fake")
+    os.environ.pop("MONGODB_URI", None)
+    os.environ["FEATURED_MONUMENTS"] = ",".join(MONUMENTS)
+
+
+def start_app():
+    import uvicorn
+    from main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=APP_PORT, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def jpeg_frame() -> bytes:
+    from PIL import Image
+
+    out = io.BytesIO()
+    Image.effect_noise((1920, 960), 40).convert("RGB").save(out, format="JPEG", quality=85)
+    return out.getvalue()
+
+
+class Scenarios:
+    """One coroutine per endpoint; each returns the httpx response."""
+
+    def __init__(self, rng: random.Random):
+        from api.city_order import load_gazetteer
+
+        self.rng = rng
+        self.cities = sorted({entry["name"] for entry in load_gazetteer().values()})
+        self.frame = jpeg_frame()
+
+    def monuments(self, n):
+        return [
+            {"id": i, "name": f"M{i}", "city": "Jaipur", "type": "monument",
+             "lat": 26.8 + self.rng.random() * 0.3, "lng": 75.7 + self.rng.random() * 0.3}
+            for i in range(n)
+        ]
+
+    async def get_monuments(self, client, session):
+        cities = self.rng.sample(["Jaipur", "Agra", "Delhi", "Udaipur", "Jodhpur"], self.rng.randint(1, 3))
+        return await client.get("/api/monuments", params={"cities": cities}, headers={"X-Session-Id": session})
+
+    async def city_order(self, client, session):
+        cities = self.rng.sample(self.cities, self.rng.randint(2, 6))
+        if self.rng.random() < 0.1:
+            cities.append(f"Nowhere{self.rng.randint(0, 10 ** 6)}")  # forces the LLM fallback
+        return await client.get("/api/city-order", params={"cities": cities})
+
+    async def compute_outliers(self, client, session):
+        payload = {
+            "cityWiseSelection": {"Jaipur": {"monuments": self.monuments(self.rng.randint(5, 40))}},
+            "interCityMap": [3],
+            "orderedCities": ["Jaipur"],
+        }
+        return await client.post("/api/compute-outliers", json=payload)
+
+    async def cluster(self, client, session):
+        payload = {"monuments": self.monuments(self.rng.randint(8, 60)), "max_per_cluster": 4,
+                   "mode": self.rng.choice(["kmeans", "balanced"])}
+        return await client.post("/api/cluster-monuments", json=payload)
+
+    async def itinerary(self, client, session):
+        days = [{"type": "monument", "monuments": self.monuments(3)} for _ in range(self.rng.randint(1, 4))]
+        for day in days:
+            day["monuments"][0]["name"] = f"Fort {self.rng.randint(0, 10 ** 6)}"  # defeat the LLM cache
+        return await client.post("/api/generate-itinerary", json={"cities": ["Jaipur"], "days": days})
+
+    async def day_route(self, client, session):
+        trip = [{"day": d, "monuments": self.monuments(self.rng.randint(2, 8))} for d in range(1, self.rng.randint(2, 8))]
+        return await client.post("/api/generate-day-route", json={"rawItinerary": trip})
+
+    async def narrate(self, client, session):
+        payload = {"monument": self.rng.choice(MONUMENTS), "timestamp": self.rng.randint(0, 599),
+                   "session_id": session, "audio_format": "url"}
+        return await client.post("/virtual-tour/narrate", json=payload)
+
+    async def ask(self, client, session):
+        data = {"question": f"What is this? {self.rng.randint(0, 10 ** 6)}", "monument": "Hawa Mahal", "audio_format": "url"}
+        files = {"image": ("frame.jpg", self.frame, "image/jpeg")}
+        return await client.post("/virtual-tour/ask", data=data, files=files)
+
+    async def ask_stream(self, client, session):
+        data = {"question": f"Tell me more {self.rng.randint(0, 10 ** 6)}", "monument": "Hawa Mahal"}
+        files = {"image": ("frame.jpg", self.frame, "image/jpeg")}
+        async with client.stream("POST", "/virtual-tour/ask/stream", data=data, files=files) as resp:
+            async for _ in resp.aiter_bytes():
+                pass
+        return resp
+
+
+WEIGHTS = {
+    "get_monuments": 3,
+    "city_order": 3,
+    "compute_outliers": 2,
+    "cluster": 2,
+    "itinerary": 1,
+    "day_route": 2,
+    "narrate": 6,
+    "ask": 1,
+    "ask_stream": 1,
+}
+
+
+async def drive(users: int, duration: float, seed: int):
+    import httpx
+
+    scenarios = Scenarios(random.Random(seed))
+    names = list(WEIGHTS)
+    weights = [WEIGHTS[n] for n in names]
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    deadline = time.perf_counter() + duration
+
+    async def user(i):
+        rng = random.Random(seed + i)
+        session = str(uuid.UUID(int=rng.getrandbits(128)))
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{APP_PORT}", timeout=60) as client:
+            while time.perf_counter() < deadline:
+                name = rng.choices(names, weights)[0]
+                start = time.perf_counter()
+                try:
+                    resp = await getattr(scenarios, name)(client, session)
+                    failed = resp.status_code >= 400
+                except Exception:
+                    failed = True
+                latencies[name].append(time.perf_counter() - start)
+                if failed:
+                    errors[name] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user(i) for i in range(users)))
+    return latencies, errors, time.perf_counter() - start
+
+
+def report(latencies, errors, elapsed):
+    total = sum(len(v) for v in latencies.values())
+    print(f"{total} requests in {elapsed:.1f}s ({total / elapsed:.1f} req/s)")
+    print(f"{'endpoint':<18}{'count':>7}{'errors':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for name in WEIGHTS:
+        samples = np.array(latencies.get(name, []))
+        if not len(samples):
+            continue
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99]) * 1000
+        print(
+            f"{name:<18}{len(samples):>7}{errors[name]:>8}"
+            f"{p50:>8.0f}ms{p95:>8.0f}ms{p99:>8.0f}ms{samples.max() * 1000:>8.0f}ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--maps-ms", type=float, default=120, help="Google Maps stub latency")
+    parser.add_argument("--gemini-ms", type=float, default=800, help="Gemini time to first token")
+    parser.add_argument("--token-ms", type=float, default=20, help="Gemini delay per token")
+    parser.add_argument("--tts-ms", type=float, default=300, help="TTS time to first byte")
+    parser.add_argument("--mongo-ms", type=float, default=5)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="applied to every fake upstream")
+    args = parser.parse_args()
+
+    configure_env(args)
+    stub = start_stub(args.maps_ms)
+
+    from benchmarks.fakes import Fault, install
+
+    install(
+        gemini=Fault(args.gemini_ms, args.error_rate, seed=args.seed),
+        tts=Fault(args.tts_ms, args.error_rate, seed=args.seed + 1),
+        mongo=Fault(args.mongo_ms, args.error_rate, seed=args.seed + 2),
+        monuments=MONUMENTS,
+        token_ms=args.token_ms,
+    )
+    app = start_app()
+
+    print(f"{args.users} users for {args.duration:.0f}s, error rate {args.error_rate:.0%}")
+    report(*asyncio.run(drive(args.users, args.duration, args.seed)))
+
+    app.should_exit = True
+    stub.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
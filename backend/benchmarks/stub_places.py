@@ -0,0 +1,79 @@
+"""Local stand-in for the Google Places Text Search, Place Details and Directions APIs.
+
+Run it with ``uvicorn benchmarks.stub_places:app --port 8765`` and point the
+backend at it with ``GOOGLE_MAPS_BASE_URL=http://127.0.0.1:8765``.
+Every call sleeps ``STUB_LATENCY_MS`` to imitate a real round trip, and
+``STUB_ERROR_RATE`` of them answer 503 instead.
+"""
+import asyncio
+import hashlib
+import os
+import random
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+LATENCY_MS = float(os.getenv("STUB_LATENCY_MS", "150"))
+ERROR_RATE = float(os.getenv("STUB_ERROR_RATE", "0"))
+RESULTS_PER_QUERY = 12
+
+app = FastAPI()
+
+
+@app.middleware("http")
+async def inject_errors(request: Request, call_next):
+    if random.random() < ERROR_RATE:
+        await asyncio.sleep(LATENCY_MS / 1000)
+        return JSONResponse({"status": "UNKNOWN_ERROR"}, status_code=503)
+    return await call_next(request)
+
+
+def _coords(place_id: str):
+    digest = hashlib.md5(place_id.encode()).digest()
+    return 26.0 + digest[0] / 255.0, 75.0 + digest[1] / 255.0
+
+
+@app.get("/place/textsearch/json")
+async def text_search(query: str, key: str = ""):
+    await asyncio.sleep(LATENCY_MS / 1000)
+    slug = hashlib.md5(query.encode()).hexdigest()[:10]
+    results = [
+        {
+            "place_id": f"{slug}-{i}",
+            "name": f"Place {i}",
+            "rating": 4.5 if i % 6 else 3.5,
+            "user_ratings_total": 1200,
+        }
+        for i in range(RESULTS_PER_QUERY)
+    ]
+    return {"results": results, "status": "OK"}
+
+
+@app.get("/place/details/json")
+async def place_details(place_id: str, fields: str = "", key: str = ""):
+    await asyncio.sleep(LATENCY_MS / 1000)
+    lat, lng = _coords(place_id)
+    return {
+        "result": {
+            "name": f"Stub {place_id}",
+            "formatted_address": f"{place_id} Road, India",
+            "rating": 4.5,
+            "website": "https://example.com",
+            "opening_hours": {"weekday_text": ["Monday: 9:00 AM – 6:00 PM"]},
+            "photos": [{"photo_reference": f"ref-{place_id}"}],
+            "geometry": {"location": {"lat": lat, "lng": lng}},
+        },
+        "status": "OK",
+    }
+
+
+@app.get("/directions/json")
+async def directions(origin: str, destination: str, key: str = "", waypoints: str = ""):
+    await asyncio.sleep(LATENCY_MS / 1000)
+    stops = [origin, *[w for w in waypoints.split("|") if w], destination]
+    legs = [
+        {"distance": {"value": 1000 * (i + 1)}, "duration": {"value": 300 * (i + 1)}}
+        for i in range(len(stops) - 1)
+    ]
+    polyline = hashlib.md5("|".join(stops).encode()).hexdigest()
+    return {"routes": [{"overview_polyline": {"points": polyline}, "legs": legs}], "status": "OK"}
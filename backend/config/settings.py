@@ -9,4 +9,59 @@ GOOGLE_API_KEY_MONUMENT = os.getenv("GOOGLE_API_KEY_MONUMENT")
 GOOGLE_GEMINI_API_KEY = os.getenv("GOOGLE_GEMINI_API_KEY")
 GOOGLE_ITENARY_API_KEY = os.getenv("GOOGLE_ITENARY_API_KEY")
 ELEVAN_LABS_API_KEY = os.getenv("ELEVAN_LABS_API_KEY")
-GIRL_VOICE_ID = os.getenv("GIRL_VOICE_ID")
\ No newline at end of file
+GIRL_VOICE_ID = os.getenv("GIRL_VOICE_ID")
+GOOGLE_MAPS_BASE_URL = os.getenv("GOOGLE_MAPS_BASE_URL", "https://maps.googleapis.com/maps/api")
+PLACES_CITY_CONCURRENCY = int(os.getenv("PLACES_CITY_CONCURRENCY", "5"))
+PLACES_DETAILS_CONCURRENCY = int(os.getenv("PLACES_DETAILS_CONCURRENCY", "20"))
+
+MONGODB_URI = os.getenv("MONGODB_URI")
+PLACE_CACHE_SIZE = int(os.getenv("PLACE_CACHE_SIZE", "5000"))
+PLACE_CACHE_TTL_SECONDS = int(os.getenv("PLACE_CACHE_TTL_SECONDS", str(24 * 3600)))
+PLACE_CACHE_PERSIST = os.getenv("PLACE_CACHE_PERSIST", "false").lower() == "true"
+
+DEDUP_MAX_SESSIONS = int(os.getenv("DEDUP_MAX_SESSIONS", "10000"))
+DEDUP_SESSION_TTL_SECONDS = int(os.getenv("DEDUP_SESSION_TTL_SECONDS", str(2 * 3600)))
+DEDUP_MAX_IDS_PER_SESSION = int(os.getenv("DEDUP_MAX_IDS_PER_SESSION", "2000"))
+
+OUTLIER_PARALLEL_THRESHOLD = int(os.getenv("OUTLIER_PARALLEL_THRESHOLD", "300"))
+
+ITINERARY_CONCURRENCY = int(os.getenv("ITINERARY_CONCURRENCY", "4"))
+
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "memory")
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "2000"))
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+CITY_ORDER_LLM_FALLBACK = os.getenv("CITY_ORDER_LLM_FALLBACK", "true").lower() == "true"
+
+NARRATION_CACHE_BYTES = int(os.getenv("NARRATION_CACHE_BYTES", str(64 * 1024 * 1024)))
+NARRATION_WARMUP = os.getenv("NARRATION_WARMUP", "true").lower() == "true"
+FEATURED_MONUMENTS = [m for m in os.getenv("FEATURED_MONUMENTS", "hawa_mahal,taj_mahal,red_fort").split(",") if m]
+
+NARRATION_MAX_SESSIONS = int(os.getenv("NARRATION_MAX_SESSIONS", "10000"))
+NARRATION_SESSION_TTL_SECONDS = int(os.getenv("NARRATION_SESSION_TTL_SECONDS", "1800"))
+
+QA_IMAGE_MAX_UPLOAD_BYTES = int(os.getenv("QA_IMAGE_MAX_UPLOAD_BYTES", str(20 * 1024 * 1024)))
+QA_IMAGE_MAX_PIXELS = int(os.getenv("QA_IMAGE_MAX_PIXELS", str(8192 * 8192)))
+QA_IMAGE_MAX_EDGE = int(os.getenv("QA_IMAGE_MAX_EDGE", "1536"))
+QA_IMAGE_JPEG_QUALITY = int(os.getenv("QA_IMAGE_JPEG_QUALITY", "85"))
+
+TTS_CACHE_BYTES = int(os.getenv("TTS_CACHE_BYTES", str(16 * 1024 * 1024)))
+TTS_CACHE_PERSIST = os.getenv("TTS_CACHE_PERSIST", "true").lower() == "true"
+TTS_CACHE_TTL_SECONDS = int(os.getenv("TTS_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+
+GOOGLE_MAPS_CONCURRENCY = int(os.getenv("GOOGLE_MAPS_CONCURRENCY", "32"))
+UPSTREAM_RETRIES = int(os.getenv("UPSTREAM_RETRIES", "2"))
+UPSTREAM_BREAKER_FAILURES = int(os.getenv("UPSTREAM_BREAKER_FAILURES", "5"))
+UPSTREAM_BREAKER_RESET_SECONDS = float(os.getenv("UPSTREAM_BREAKER_RESET_SECONDS", "30"))
+
+PREWARM_IMPORTS = os.getenv("PREWARM_IMPORTS", "false").lower() == "true"
+
+STATIC_PRECOMPRESS = os.getenv("STATIC_PRECOMPRESS", "false").lower() == "true"
+STATIC_MAX_AGE = int(os.getenv("STATIC_MAX_AGE", "3600"))
+
+CATALOG_BACKEND = os.getenv("CATALOG_BACKEND", "file")
+CATALOG_PATH = os.getenv("CATALOG_PATH", os.path.join(os.path.dirname(__file__), "..", "data", "catalog.json.gz"))
+CATALOG_MAX_AGE_SECONDS = int(os.getenv("CATALOG_MAX_AGE_SECONDS", str(7 * 24 * 3600)))
+CATALOG_REFRESH_SECONDS = int(os.getenv("CATALOG_REFRESH_SECONDS", "0"))
+
+SPATIAL_MAX_PLACES = int(os.getenv("SPATIAL_MAX_PLACES", "50000"))
@@ -1,14 +1,102 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import PlainTextResponse
+from contextlib import asynccontextmanager
+import asyncio
+import importlib
 import os
+import time
 
 from api.routes import router as api_router
 from api.google_api import router as key_router
 from api.quotient_api import router as quotient_router
+from api.narrate import warm_up as warm_up_narration
+from api.upstream import close_clients
+from api.metrics import cache_lines, http_request_seconds, registry
+from api.place_cache import details_cache, search_cache
+from api.directions import directions_cache
+from api.catalog import catalog
+from api.llm_cache import llm_cache
+from api.tts_cache import tts_cache
+from api.narrate import audio_cache as narration_cache
+from api import geo
+from api.byte_ranges import IMMUTABLE
+from api.static_assets import AssetFiles, IndexPage, precompress_all
+from config.settings import (
+    FEATURED_MONUMENTS, GOOGLE_API_KEY_MONUMENT, NARRATION_WARMUP, PREWARM_IMPORTS, STATIC_MAX_AGE, STATIC_PRECOMPRESS
+)
+
+# Imported on first use by the handlers that need them, or up front with PREWARM_IMPORTS.
+HEAVY_MODULES = ["sklearn.cluster", "scipy.optimize", "google.generativeai", "elevenlabs.client"]
+
+
+def prewarm_imports():
+    for name in HEAVY_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            print(f"Pre-warm import of {name} failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm the narration cache in the background so startup isn't held up by Mongo.
+    warmup = asyncio.create_task(warm_up_narration(FEATURED_MONUMENTS)) if NARRATION_WARMUP else None
+    if PREWARM_IMPORTS:
+        # Finished before the first request on purpose: loading extension modules on a thread
+        # while scikit-learn's threadpoolctl walks the loaded libraries can deadlock.
+        await asyncio.to_thread(prewarm_imports)
+    # Opt-in: sidecars normally come from `python -m api.static_assets` at build time.
+    precompress = asyncio.create_task(asyncio.to_thread(precompress_all, STATIC_DIRS)) if STATIC_PRECOMPRESS else None
+    # Requests go to live Places until the catalog has loaded; refreshing is opt-in (see api.catalog).
+    catalog_refresh = asyncio.create_task(catalog.run(GOOGLE_API_KEY_MONUMENT))
+    yield
+    catalog_refresh.cancel()
+    if warmup is not None:
+        warmup.cancel()
+    if precompress is not None:
+        precompress.cancel()
+    await close_clients()
+
+
+frontend_path = os.path.join(os.path.dirname(__file__), "..", "dist")
+STATIC_DIRS = [os.path.join(frontend_path, name) for name in ("assets", "models", "animations")]
+index_page = IndexPage(os.path.join(frontend_path, "index.html"))
+
+
+app = FastAPI(lifespan=lifespan)
+
+@app.middleware("http")
+async def time_requests(request: Request, call_next):
+    # Time to response start; the body of a streaming response may still be in flight.
+    start = time.perf_counter()
+    status = "500"
+    try:
+        response = await call_next(request)
+        status = str(response.status_code)
+        return response
+    finally:
+        route = request.scope.get("route")
+        http_request_seconds.observe(
+            time.perf_counter() - start, request.method, getattr(route, "path", "unmatched"), status
+        )
+
+
+@registry.collector
+def cache_metrics():
+    yield from cache_lines("place", {
+        "details": details_cache.stats(),
+        "search": search_cache.stats(),
+        "directions": directions_cache.stats(),
+        "catalog": catalog.stats(),
+    })
+    yield from cache_lines("llm", llm_cache.stats()["endpoints"])
+    yield from cache_lines("audio", {
+        "tts": tts_cache.stats(),
+        "narration": narration_cache.stats(),
+    })
+    yield from cache_lines("geo", {"distance_matrix": geo.cache_info()})
 
-app = FastAPI()
 
 # CORS
 app.add_middleware(
@@ -19,24 +107,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-frontend_path = os.path.join(os.path.dirname(__file__), "..", "dist")
-
 # Mount folders
+# Vite fingerprints everything under /assets, so those never change under the same URL.
 app.mount(
     "/models",
-    StaticFiles(directory=os.path.join(frontend_path, "models")),
+    AssetFiles(os.path.join(frontend_path, "models"), cache_control=f"public, max-age={STATIC_MAX_AGE}"),
     name="models",
 )
 
 app.mount(
     "/assets",
-    StaticFiles(directory=os.path.join(frontend_path, "assets")),
+    AssetFiles(os.path.join(frontend_path, "assets"), cache_control=IMMUTABLE),
     name="assets",
 )
 
 app.mount(
     "/animations",
-    StaticFiles(directory=os.path.join(frontend_path, "animations")),
+    AssetFiles(os.path.join(frontend_path, "animations"), cache_control=f"public, max-age={STATIC_MAX_AGE}"),
     name="animations",
 )
 
@@ -48,6 +135,10 @@ app.include_router(api_router)
 app.include_router(key_router)
 app.include_router(quotient_router)
 
+@app.get("/metrics")
+def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/{full_path:path}")
-def serve_react_app(full_path: str):
-    return FileResponse(os.path.join(frontend_path, "index.html"))
+def serve_react_app(full_path: str, request: Request):
+    return index_page.response(request)
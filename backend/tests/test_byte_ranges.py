@@ -0,0 +1,43 @@
+import pytest
+
+from api.byte_ranges import parse_range
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, None),
+        ("", None),
+        ("bytes=0-99", (0, 99)),
+        ("bytes=10-", (10, 99)),
+        ("bytes=99-99", (99, 99)),
+        (" bytes=5-9 ", (5, 9)),
+        # suffix ranges: the last N bytes, or the whole body if N is larger
+        ("bytes=-1", (99, 99)),
+        ("bytes=-30", (70, 99)),
+        ("bytes=-100", (0, 99)),
+        ("bytes=-500", (0, 99)),
+        # an end past the last byte is clamped
+        ("bytes=50-1000", (50, 99)),
+        ("bytes=0-100", (0, 99)),
+        # multi-range and anything unparseable fall back to the whole body
+        ("bytes=0-9,20-29", None),
+        ("bytes=0-9, 20-", None),
+        ("bytes=-", None),
+        ("items=0-9", None),
+        ("bytes=a-b", None),
+    ],
+)
+def test_parse_range(header, expected):
+    assert parse_range(header, 100) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=100-", "bytes=100-200", "bytes=500-", "bytes=20-10", "bytes=-0"])
+def test_unsatisfiable_ranges(header):
+    with pytest.raises(ValueError):
+        parse_range(header, 100)
+
+
+def test_empty_body_has_no_satisfiable_start():
+    with pytest.raises(ValueError):
+        parse_range("bytes=0-", 0)
@@ -0,0 +1,54 @@
+from itertools import permutations
+
+import numpy as np
+import pytest
+
+from api.geo import pairwise_km
+from api.route_solver import heuristic_path, held_karp_path, path_cost, solve_open_path, solve_path
+
+
+def random_dist(n: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    coords = np.column_stack([rng.uniform(26.8, 27.0, n), rng.uniform(75.7, 75.9, n)])
+    return pairwise_km(coords, cache=False)
+
+
+def brute_force_cost(dist: np.ndarray, fixed_end: bool) -> float:
+    n = len(dist)
+    inner = range(1, n - 1) if fixed_end else range(1, n)
+    tail = [n - 1] if fixed_end else []
+    return min(path_cost(dist, [0, *perm, *tail]) for perm in permutations(inner))
+
+
+def assert_visits_all(path, n):
+    assert sorted(path) == list(range(n))
+
+
+@pytest.mark.parametrize("n", range(3, 9))
+@pytest.mark.parametrize("seed", range(5))
+def test_held_karp_matches_brute_force(n, seed):
+    dist = random_dist(n, seed)
+    path = held_karp_path(dist)
+    assert_visits_all(path, n)
+    assert (path[0], path[-1]) == (0, n - 1)
+    assert path_cost(dist, path) == pytest.approx(brute_force_cost(dist, fixed_end=True))
+    assert path_cost(dist, solve_path(dist)) == pytest.approx(brute_force_cost(dist, fixed_end=True))
+
+
+@pytest.mark.parametrize("n", range(2, 9))
+@pytest.mark.parametrize("seed", range(5))
+def test_open_path_matches_brute_force(n, seed):
+    dist = random_dist(n, seed)
+    path = solve_open_path(dist)
+    assert_visits_all(path, n)
+    assert path[0] == 0
+    assert path_cost(dist, path) == pytest.approx(brute_force_cost(dist, fixed_end=False))
+
+
+@pytest.mark.parametrize("n", [2, 3, 5, 16, 30, 60])
+@pytest.mark.parametrize("seed", range(3))
+def test_heuristic_keeps_endpoints(n, seed):
+    dist = random_dist(n, seed)
+    path = heuristic_path(dist)
+    assert_visits_all(path, n)
+    assert (path[0], path[-1]) == (0, n - 1)
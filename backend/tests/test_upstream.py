@@ -0,0 +1,82 @@
+import pytest
+
+from api import upstream
+from api.upstream import CircuitBreaker
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(upstream.time, "monotonic", clock)
+    return clock
+
+
+def open_breaker(breaker: CircuitBreaker):
+    for _ in range(breaker.failures):
+        assert breaker.allow()
+        breaker.record_failure()
+
+
+def test_closed_until_failures_in_a_row(clock):
+    breaker = CircuitBreaker(failures=3, reset_after=30)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_success()
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == "closed"  # the success reset the count
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_open_becomes_half_open_after_cooldown(clock):
+    breaker = CircuitBreaker(failures=2, reset_after=30)
+    open_breaker(breaker)
+    clock.now += 29.9
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    clock.now += 0.1
+    assert breaker.state == "half-open"
+
+
+def test_half_open_lets_one_probe_through(clock):
+    breaker = CircuitBreaker(failures=2, reset_after=30)
+    open_breaker(breaker)
+    clock.now += 30
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+
+
+def test_half_open_closes_on_success(clock):
+    breaker = CircuitBreaker(failures=2, reset_after=30)
+    open_breaker(breaker)
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow() and breaker.allow()
+
+
+def test_half_open_reopens_on_failure(clock):
+    breaker = CircuitBreaker(failures=5, reset_after=30)
+    for _ in range(5):
+        breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_failure()  # one failed probe is enough, not another `failures` in a row
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    clock.now += 30
+    assert breaker.state == "half-open"
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from api.voice_stream import split_sentences, stream_speech, text_tokens
+
+
+class CountingSynth:
+    """Fake TTS that records how many syntheses are running at once."""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, sentence: str):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            for part in (sentence, "|"):
+                await asyncio.sleep(self.delay)
+                yield part.encode()
+        finally:
+            self.active -= 1
+
+
+async def sentences(count: int):
+    for i in range(count):
+        yield f"s{i}"
+
+
+def collect(lookahead: int, count: int = 8, delay: float = 0.01):
+    synth = CountingSynth(delay)
+
+    async def run():
+        return b"".join([chunk async for chunk in stream_speech(sentences(count), synth, lookahead)])
+
+    return asyncio.run(run()), synth
+
+
+@pytest.mark.parametrize("lookahead", [1, 2, 3])
+def test_peak_concurrency_equals_lookahead(lookahead):
+    audio, synth = collect(lookahead)
+    assert synth.peak == lookahead
+    assert audio == b"".join(f"s{i}|".encode() for i in range(8))
+
+
+def test_slow_consumer_does_not_start_more_syntheses():
+    synth = CountingSynth(delay=0)
+
+    async def run():
+        async for _ in stream_speech(sentences(10), synth, lookahead=2):
+            await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+    assert synth.peak <= 2
+
+
+def test_split_sentences():
+    async def run():
+        return [s async for s in split_sentences(text_tokens("One. Two!  Three? Four"))]
+
+    assert asyncio.run(run()) == ["One.", "Two!", "Three?", "Four"]
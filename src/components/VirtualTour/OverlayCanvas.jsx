@@ -5,6 +5,9 @@ import { OrbitControls } from "@react-three/drei";
 import { Avatar } from "./Avatar";
 import { useLocation, useNavigate } from "react-router-dom";
 import LoadingOverlay from "../LoadingOverlay";
+import { getSessionId } from "@/lib/utils";
+
+const TOUR_API = "https://virtuvoyagee.onrender.com";
 
 function getScriptChunk(time) {
   const chunks = ["0_15", "15_30", "30_45", "45_60"];
@@ -185,7 +188,7 @@ export default function OverlayApp() {
 
   const fetchNarrationAudio = async (timestamp) => {
     try {
-      const response = await fetch("https://virtuvoyagee.onrender.com/virtual-tour/narrate", {
+      const response = await fetch(`${TOUR_API}/virtual-tour/narrate`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -194,34 +197,30 @@ export default function OverlayApp() {
           monument: selectedMonument,
           timestamp: timestamp,
           source: screenStream ? "screen" : "video",
+          session_id: getSessionId(),
+          audio_format: "url",
         }),
       });
 
+      // 204: still inside the clip that is already playing.
+      if (response.status === 204) return;
+
       const data = await response.json();
 
-      if (data.audio_base64) {
+      if (data.audio_url) {
         if (narrationAudioRef.current) {
           narrationAudioRef.current.pause();
           narrationAudioRef.current = null;
         }
 
-        const audioBlob = new Blob(
-          [Uint8Array.from(atob(data.audio_base64), c => c.charCodeAt(0))],
-          { type: "audio/mpeg" }
-        );
-
-        const audioUrl = URL.createObjectURL(audioBlob);
-        const audio = new Audio(audioUrl);
+        // Clips are immutable and served with Range support, so the browser streams and caches them.
+        const audio = new Audio(`${TOUR_API}${data.audio_url}`);
 
         narrationAudioRef.current = audio;
 
         if (!isNarrationPaused) {
           audio.play().catch((err) => console.error("Audio play error:", err));
         }
-
-        audio.onended = () => {
-          URL.revokeObjectURL(audioUrl);
-        };
       } else {
         console.warn("No audio received from backend for:", selectedMonument, "@", timestamp);
       }
@@ -304,35 +303,26 @@ export default function OverlayApp() {
       const formData = new FormData();
       formData.append("monument", selectedMonument);
       formData.append("question", userQuery);
-      formData.append("image", blob, "screenshot.png");
+      formData.append("image", blob, "screenshot.jpg");
+      formData.append("audio_format", "url");
 
       try {
-        const response = await fetch("https://virtuvoyagee.onrender.com/virtual-tour/ask", {
+        const response = await fetch(`${TOUR_API}/virtual-tour/ask`, {
           method: "POST",
           body: formData,
         });
 
         const data = await response.json();
 
-        const base64Audio = data.audio_base64;
-        if (base64Audio) {
+        if (data.audio_url) {
           if (narrationAudioRef.current) {
             narrationAudioRef.current.pause();
             narrationAudioRef.current = null;
           }
 
-          const audioBlob = new Blob(
-            [Uint8Array.from(atob(base64Audio), c => c.charCodeAt(0))],
-            { type: 'audio/mpeg' }
-          );
-          const audioUrl = URL.createObjectURL(audioBlob);
-          const audio = new Audio(audioUrl);
+          const audio = new Audio(`${TOUR_API}${data.audio_url}`);
 
           audio.play().catch(err => console.error("Ask audio play error:", err));
-
-          audio.onended = () => {
-            URL.revokeObjectURL(audioUrl);
-          };
         } else {
           console.error("No audio received from backend for user question");
         }
@@ -343,7 +333,7 @@ export default function OverlayApp() {
         setUserQuery("");
         video.play();
       }
-    });
+    }, "image/jpeg", 0.9);
   };
 
   const getNarrationButtonText = () => {
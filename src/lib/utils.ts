@@ -4,3 +4,14 @@ import { twMerge } from "tailwind-merge"
 export function cn(...inputs: ClassValue[]) {
   return twMerge(clsx(inputs))
 }
+
+const SESSION_STORAGE_KEY = "voyage-session-id"
+
+export function getSessionId(): string {
+  let id = sessionStorage.getItem(SESSION_STORAGE_KEY)
+  if (!id) {
+    id = crypto.randomUUID()
+    sessionStorage.setItem(SESSION_STORAGE_KEY, id)
+  }
+  return id
+}
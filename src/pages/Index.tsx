@@ -9,7 +9,7 @@ import { MapPin, Calendar as CalendarIcon } from "lucide-react";
 import { toast } from "sonner";
 import { useNavigate } from "react-router-dom";
 import { format } from "date-fns";
-import { cn } from "@/lib/utils";
+import { cn, getSessionId } from "@/lib/utils";
 import { APIProvider } from "@vis.gl/react-google-maps";
 import LocationSearchPanel from "@/components/Planner/Search box/LocationSearchPanel";
 import Map from "@/components/Planner/Map display/Map";
@@ -86,6 +86,7 @@ const Index = () => {
       await new Promise(resolve => setTimeout(resolve, 1000));
       await fetch("/api/reset-monuments", {
         method: "POST",
+        headers: { "X-Session-Id": getSessionId() },
       });
 
       const tripData = { selectedState: state, duration: Number(tripDays), startDate };
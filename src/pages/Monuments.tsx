@@ -9,6 +9,7 @@ import BackgroundPattern from "@/components/BackgroundPattern";
 import MonumentCard from "@/components/MonumentCard";
 import { Monument, TripData } from "@/types/travel";
 import LoadingOverlay from "@/components/LoadingOverlay";
+import { getSessionId } from "@/lib/utils";
 
 const Monuments = () => {
   const navigate = useNavigate();
@@ -49,8 +50,8 @@ const Monuments = () => {
 
         for (const city of cities) {
           const [monumentsRes, fullDayRes] = await Promise.all([
-            fetch(`/api/monuments?cities=${city}`),
-            fetch(`/api/full-day?cities=${city}`)
+            fetch(`/api/monuments?cities=${city}`, { headers: { "X-Session-Id": getSessionId() } }),
+            fetch(`/api/full-day?cities=${city}`, { headers: { "X-Session-Id": getSessionId() } })
           ]);
 
           const monuments = ((await monumentsRes.json()).results || []).map((m: Monument) => ({